@@ -0,0 +1,15 @@
+from typing import Any, Dict, Tuple, Union
+
+RequestSpec = Union[str, Tuple[str, str], Tuple[str, str, Dict[str, Any]]]
+
+
+def normalize_request(spec: RequestSpec) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    The (method, path, kwargs) of a path, a (method, path) tuple or a
+    (method, path, kwargs) tuple
+    """
+    if isinstance(spec, str):
+        return "GET", spec, {}
+    if len(spec) == 2:
+        return spec[0].upper(), spec[1], {}  # type: ignore
+    return spec[0].upper(), spec[1], dict(spec[2])  # type: ignore
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, List, Optional, Union
+
+_MISSING = object()
+
+_WHITESPACE = b" \t\r\n"
+_SCALAR_END = b" \t\r\n,]}"
+_STRING_SPECIAL = re.compile(rb'["\\]')
+# A complete string, a bracket, or the start of a string that continues
+# in the next chunk
+_CONTAINER_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"')
+_SCALAR_END_SEARCH = re.compile(rb"[ \t\r\n,\]}]")
+_PATH_PART = re.compile(r"\.([^.\[\]]+)|\[(\d+)\]|\[[\"']([^\"']*)[\"']\]")
+
+
+class BodyCheck(ABC):
+    """
+    Base class for assertions computed incrementally over a response body
+
+    Pass instances to any client request as ``body_checks=[...]``. The
+    response body is then fed to the checks chunk by chunk as it arrives
+    and is not retained on the response, so arbitrarily large payloads
+    can be verified in constant memory. Checks with an expected value are
+    verified when the request completes and raise AssertionError.
+    """
+
+    @abstractmethod
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the body"""
+
+    def finish(self) -> None:
+        """Called once the whole body has been fed"""
+
+    def verify(self) -> None:
+        """Raise AssertionError if the body did not match"""
+
+
+def feed_all(checks: Iterable[BodyCheck], chunk: bytes) -> None:
+    for check in checks:
+        check.feed(chunk)
+
+
+def verify_all(checks: Optional[Iterable[BodyCheck]]) -> None:
+    for check in checks or ():
+        check.finish()
+        check.verify()
+
+
+class Digest(BodyCheck):
+    def __init__(
+        self, algorithm: str = "sha256", expected: Optional[str] = None
+    ) -> None:
+        self.algorithm = algorithm
+        self.expected = expected
+        self._hash = hashlib.new(algorithm)
+
+    @property
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def feed(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+
+    def verify(self) -> None:
+        if self.expected is not None and self.hexdigest != self.expected:
+            raise AssertionError(
+                f"Body {self.algorithm} digest {self.hexdigest} does not "
+                f"match expected {self.expected}"
+            )
+
+
+class Length(BodyCheck):
+    def __init__(self, expected: Optional[int] = None) -> None:
+        self.expected = expected
+        self.length = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.length += len(chunk)
+
+    def verify(self) -> None:
+        if self.expected is not None and self.length != self.expected:
+            raise AssertionError(
+                f"Body length {self.length} does not match expected "
+                f"{self.expected}"
+            )
+
+
+class Prefix(BodyCheck):
+    def __init__(self, expected: bytes) -> None:
+        self.expected = expected
+        self.prefix = b""
+
+    def feed(self, chunk: bytes) -> None:
+        missing = len(self.expected) - len(self.prefix)
+        if missing > 0:
+            self.prefix += chunk[:missing]
+
+    def verify(self) -> None:
+        if self.prefix != self.expected:
+            raise AssertionError(
+                f"Body starts with {self.prefix!r}, expected "
+                f"{self.expected!r}"
+            )
+
+
+def parse_json_path(path: str) -> List[Union[str, int]]:
+    """Parse a JSONPath subset: $.key.other[0]['quoted key']"""
+    if not path.startswith("$"):
+        path = f"$.{path}"
+    parts: List[Union[str, int]] = []
+    position = 1
+    while position < len(path):
+        match = _PATH_PART.match(path, position)
+        if not match:
+            raise ValueError(f"Unsupported JSON path: {path}")
+        key, index, quoted = match.groups()
+        if index is not None:
+            parts.append(int(index))
+        else:
+            parts.append(key if key is not None else quoted)
+        position = match.end()
+    return parts
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "state")
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key: Union[str, int, None] = None if is_object else 0
+        self.state = "key" if is_object else "value"
+
+
+class JSONPath(BodyCheck):
+    """
+    Extract a single value from a JSON body without parsing the rest
+
+    The body is scanned incrementally and only the bytes of the matched
+    value are buffered. Containers that cannot hold the path are skipped
+    by bracket matching alone, and scanning stops once the value has been
+    found.
+    """
+
+    def __init__(self, path: str, expected: Any = _MISSING) -> None:
+        self.path = path
+        self.expected = expected
+        self.found = False
+        self.value: Any = None
+        self._target = parse_json_path(path)
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._in_scalar = False
+        self._key: Optional[bytearray] = None
+        self._capture: Optional[bytearray] = None
+        self._capture_depth = 0
+        self._skip_depth = 0
+        self._skip_in_string = False
+
+    def _path(self) -> List[Union[str, int, None]]:
+        return [frame.key for frame in self._stack]
+
+    def feed(self, chunk: bytes) -> None:
+        index = 0
+        length = len(chunk)
+        while index < length and not self.found:
+            if self._skip_depth:
+                index = self._skip(chunk, index)
+                continue
+            if self._in_scalar and self._capture is None:
+                match = _SCALAR_END_SEARCH.search(chunk, index)
+                if not match:
+                    break
+                index = match.start()
+            elif self._in_string and not self._escape:
+                # Skip ahead to the next quote or backslash
+                match = _STRING_SPECIAL.search(chunk, index)
+                end = match.start() if match else length
+                if end > index:
+                    self._string_bytes(chunk[index:end])
+                    index = end
+                    continue
+            self._feed_byte(chunk[index])
+            index += 1
+
+    def _skip(self, chunk: bytes, index: int) -> int:
+        length = len(chunk)
+        while index < length:
+            if self._skip_in_string:
+                if self._escape:
+                    self._escape = False
+                    index += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, index)
+                if not match:
+                    return length
+                index = match.end()
+                if chunk[match.start()] == 0x5C:  # backslash
+                    self._escape = True
+                else:
+                    self._skip_in_string = False
+                continue
+            match = _CONTAINER_TOKEN.search(chunk, index)
+            if not match:
+                return length
+            index = match.end()
+            byte = chunk[match.start()]
+            if byte == 0x22:
+                if index - match.start() == 1:
+                    self._skip_in_string = True
+            elif byte in b"{[":
+                self._skip_depth += 1
+            else:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._value_end()
+                    return index
+        return index
+
+    def _string_bytes(self, data: bytes) -> None:
+        if self._key is not None:
+            self._key.extend(data)
+        if self._capture is not None:
+            self._capture.extend(data)
+
+    def _feed_byte(self, byte: int) -> None:
+        if self._in_scalar and byte in _SCALAR_END:
+            self._in_scalar = False
+            self._value_end()
+            if self.found:
+                return
+
+        if self._in_string:
+            self._string_bytes(bytes((byte,)))
+            if self._escape:
+                self._escape = False
+            elif byte == 0x5C:  # backslash
+                self._escape = True
+            elif byte == 0x22:  # quote
+                self._in_string = False
+                if self._key is not None:
+                    self._key_end()
+                else:
+                    self._value_end()
+            return
+
+        if self._capture is not None:
+            self._capture.append(byte)
+        if self._in_scalar or byte in _WHITESPACE:
+            return
+
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None:
+            if frame.state == "key":
+                if byte == 0x22:
+                    self._in_string = True
+                    self._key = bytearray(b'"')
+                elif byte == 0x7D:  # } closing an empty object
+                    self._close()
+                return
+            if frame.state == "colon":
+                frame.state = "value"
+                return
+            if frame.state == "comma":
+                if byte == 0x2C:  # ,
+                    if frame.is_object:
+                        frame.state = "key"
+                    else:
+                        frame.key += 1  # type: ignore
+                        frame.state = "value"
+                else:
+                    self._close()
+                return
+            if byte == 0x5D:  # ] closing an empty array
+                self._close()
+                return
+        self._value_start(byte)
+
+    def _value_start(self, byte: int) -> None:
+        if self._capture is None:
+            path = self._path()
+            depth = len(path)
+            if path == self._target:
+                self._capture = bytearray((byte,))
+                self._capture_depth = depth
+            elif byte in b"{[" and (
+                depth >= len(self._target) or path != self._target[:depth]
+            ):
+                self._skip_depth = 1
+                return
+        if byte == 0x7B:  # {
+            self._stack.append(_Frame(is_object=True))
+        elif byte == 0x5B:  # [
+            self._stack.append(_Frame(is_object=False))
+        elif byte == 0x22:
+            self._in_string = True
+        else:
+            self._in_scalar = True
+
+    def _key_end(self) -> None:
+        key = json.loads(bytes(self._key))  # type: ignore
+        self._key = None
+        frame = self._stack[-1]
+        frame.key = key
+        frame.state = "colon"
+
+    def _close(self) -> None:
+        self._stack.pop()
+        self._value_end()
+
+    def _value_end(self) -> None:
+        if (
+            self._capture is not None
+            and len(self._stack) == self._capture_depth
+        ):
+            self.value = json.loads(bytes(self._capture))
+            self.found = True
+            self._capture = None
+            return
+        if self._stack:
+            self._stack[-1].state = "comma"
+
+    def finish(self) -> None:
+        # A scalar at the very end of the body has no terminating byte
+        if self._in_scalar:
+            self._in_scalar = False
+            self._value_end()
+
+    def verify(self) -> None:
+        if not self.found:
+            raise AssertionError(f"JSON path {self.path} not found in body")
+        if self.expected is not _MISSING and self.value != self.expected:
+            raise AssertionError(
+                f"JSON path {self.path} is {self.value!r}, expected "
+                f"{self.expected!r}"
+            )
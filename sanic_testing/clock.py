@@ -0,0 +1,107 @@
+import asyncio
+import selectors
+import time
+from contextlib import contextmanager
+from typing import Optional
+from unittest import mock
+
+
+class _VirtualSelector:
+    """
+    Wraps the loop's selector so that, instead of waiting for the next
+    timer, the loop's clock jumps straight to it
+    """
+
+    def __init__(self, selector: selectors.BaseSelector) -> None:
+        self._selector = selector
+        self.loop: Optional["VirtualClockEventLoop"] = None
+
+    def select(self, timeout: Optional[float] = None):
+        events = self._selector.select(0)
+        if events or timeout == 0 or self.loop is None:
+            return events
+        if timeout is None or self.loop._executor_jobs:
+            # Nothing scheduled, or a thread will wake us up: only real
+            # I/O can make progress, so wait for it
+            events = self._selector.select(timeout)
+            if events or timeout is None:
+                return events
+        self.loop._now += timeout
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    An event loop whose clock only moves when the loop would otherwise
+    wait for a timer
+
+    asyncio.sleep(), timeouts, call_later() and anything else scheduled
+    on loop.time() complete immediately and in order, as if the time had
+    passed. Real I/O, such as the sockets of a live test server, still
+    works, since the clock only jumps when no I/O is ready. Code that
+    reads time.monotonic() or time.time() directly is not affected unless
+    run inside patch_time().
+    """
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        selector = _VirtualSelector(selectors.DefaultSelector())
+        super().__init__(selector)  # type: ignore
+        selector.loop = self
+        self._now = time.monotonic() if start is None else start
+        self._start = self._now
+        self._executor_jobs = 0
+
+    def time(self) -> float:
+        return self._now
+
+    @property
+    def elapsed(self) -> float:
+        """Virtual seconds since the loop was created"""
+        return self._now - self._start
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move the clock forward. When called from outside the loop, the
+        loop runs until the new time, so that the timers due in between
+        fire in order.
+        """
+        if seconds < 0:
+            raise ValueError("The clock cannot go backward")
+        if self.is_running():
+            self._now += seconds
+        else:
+            self.run_until_complete(asyncio.sleep(seconds))
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self._executor_jobs += 1
+        future.add_done_callback(self._executor_job_done)
+        return future
+
+    def _executor_job_done(self, _) -> None:
+        self._executor_jobs -= 1
+
+    @contextmanager
+    def patch_time(self):
+        """
+        Make time.monotonic(), time.perf_counter() and time.time() follow
+        the virtual clock, for code that does not use loop.time()
+        """
+        offset = time.time() - self._now
+        with mock.patch("time.monotonic", self.time), mock.patch(
+            "time.perf_counter", self.time
+        ), mock.patch("time.time", lambda: self._now + offset):
+            yield self
+
+
+class VirtualClockEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """
+    Creates VirtualClockEventLoops, for async test suites that let you
+    choose the event loop policy their tests run on
+    """
+
+    def new_event_loop(self) -> VirtualClockEventLoop:
+        return VirtualClockEventLoop()
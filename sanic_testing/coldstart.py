@@ -0,0 +1,365 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sanic import Sanic
+
+from sanic_testing._report import render_table
+from sanic_testing.load import LatencySummary
+from sanic_testing.testing import HOST
+
+PHASES = ("construct", "test_manager", "boot", "first_response", "process")
+SERVERS = ("run", "create_server")
+
+# Marks the line of child output that holds the timings, since the
+# server logs to the same streams
+_MARKER = "sanic-testing-coldstart:"
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ColdStartRun:
+    """Timings of one cold start, in seconds, by phase"""
+
+    def __init__(
+        self, phases: Dict[str, float], error: Optional[str] = None
+    ) -> None:
+        self.phases = phases
+        self.error = error
+
+    def __repr__(self) -> str:
+        if self.error:
+            return f"<ColdStartRun error={self.error!r}>"
+        return f"<ColdStartRun process={self.phases.get('process', 0):.6f}>"
+
+
+class ColdStartResult:
+    def __init__(self, runs: List[ColdStartRun]) -> None:
+        self.runs = runs
+
+    @property
+    def errors(self) -> List[ColdStartRun]:
+        return [run for run in self.runs if run.error]
+
+    def phase(self, name: str) -> LatencySummary:
+        return LatencySummary(
+            run.phases[name]
+            for run in self.runs
+            if not run.error and name in run.phases
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": len(self.runs),
+            "errors": [run.error for run in self.errors],
+            "phases": {name: self.phase(name).as_dict() for name in PHASES},
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<ColdStartResult runs={len(self.runs)} "
+            f"errors={len(self.errors)} process={self.phase('process')!r}>"
+        )
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def _first_response(url: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(verify=False) as client:
+        while True:
+            try:
+                response = await client.get(url)
+                if response.is_success:
+                    return
+                problem = f"status {response.status_code}"
+            except httpx.TransportError as e:
+                problem = repr(e)
+            if time.perf_counter() > deadline:
+                raise TimeoutError(
+                    f"No successful response from {url} within "
+                    f"{timeout}s, last: {problem}"
+                )
+            await asyncio.sleep(0.005)
+
+
+def measure(
+    target: str,
+    path: str = "/",
+    factory: bool = False,
+    server: str = "run",
+    host: str = HOST,
+    timeout: float = 30.0,
+) -> Dict[str, float]:
+    """
+    Time one cold start of the app in this process: loading the app,
+    attaching a TestManager, booting the server and the first successful
+    response to GET ``path``
+
+    ``server`` is "run", to boot with app.run() as SanicTestClient does,
+    or "create_server", to boot with app.create_server() as
+    ReusableClient does. Run it in a fresh interpreter, which
+    ColdStartBenchmark does, for the timings to be meaningful.
+    """
+    from sanic.worker.loader import AppLoader
+
+    from sanic_testing.manager import TestManager
+
+    if server not in SERVERS:
+        raise ValueError(f"server must be one of {SERVERS}")
+    phases: Dict[str, float] = {}
+    Sanic.test_mode = True
+
+    start = time.perf_counter()
+    app = AppLoader(target, as_factory=factory).load()
+    phases["construct"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TestManager(app)
+    phases["test_manager"] = time.perf_counter() - start
+
+    port = _free_port(host)
+    url = f"http://{host}:{port}/{path.lstrip('/')}"
+    if server == "run":
+        _boot_with_run(app, host, port, url, timeout, phases)
+    else:
+        _boot_with_create_server(app, host, port, url, timeout, phases)
+    return phases
+
+
+def _boot_with_run(app, host, port, url, timeout, phases) -> None:
+    errors: List[BaseException] = []
+
+    async def first_response(app, *_):
+        phases["boot"] = time.perf_counter() - start
+        served = time.perf_counter()
+        try:
+            await _first_response(url, timeout)
+            phases["first_response"] = time.perf_counter() - served
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            app.stop()
+
+    app.after_server_start(first_response)
+    start = time.perf_counter()
+    app.run(host=host, port=port, single_process=True, access_log=False)
+    if errors:
+        raise errors[0]
+
+
+def _boot_with_create_server(app, host, port, url, timeout, phases) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    run = loop.run_until_complete
+
+    start = time.perf_counter()
+    app.router.reset()
+    app.signal_router.reset()
+    run(app._startup())
+    run(app._server_event("init", "before", loop=loop))
+    server = run(
+        app.create_server(
+            host=host,
+            port=port,
+            return_asyncio_server=True,
+            access_log=False,
+        )
+    )
+    run(app._server_event("init", "after", loop=loop))
+    phases["boot"] = time.perf_counter() - start
+    try:
+        served = time.perf_counter()
+        run(_first_response(url, timeout))
+        phases["first_response"] = time.perf_counter() - served
+    finally:
+        run(app._server_event("shutdown", "before", loop=loop))
+        server.close()
+        run(server.wait_closed())
+        run(app._server_event("shutdown", "after", loop=loop))
+        loop.close()
+
+
+class ColdStartBenchmark:
+    """
+    Measure end to end cold starts of an app, each in a fresh Python
+    subprocess, from a "module:app" target as accepted by the sanic CLI
+
+    Each run reports the phases timed by measure(), and ``process``: the
+    time from launching the interpreter to the first successful response,
+    which includes interpreter start up and imports.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        runs: int = 10,
+        path: str = "/",
+        factory: bool = False,
+        server: str = "run",
+        timeout: float = 30.0,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if server not in SERVERS:
+            raise ValueError(f"server must be one of {SERVERS}")
+        self.target = target
+        self.runs = runs
+        self.path = path
+        self.factory = factory
+        self.server = server
+        self.timeout = timeout
+        self.cwd = cwd
+        self.env = env
+
+    def _command(self) -> List[str]:
+        command = [
+            sys.executable,
+            "-m",
+            "sanic_testing.coldstart",
+            self.target,
+            "--once",
+            "--path",
+            self.path,
+            "--server",
+            self.server,
+            "--timeout",
+            str(self.timeout),
+        ]
+        if self.factory:
+            command.append("--factory")
+        return command
+
+    def run_once(self) -> ColdStartRun:
+        env = dict(os.environ if self.env is None else self.env)
+        # Let the target module be found relative to cwd, like the CLI,
+        # and sanic_testing wherever it was imported from here
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(
+                None,
+                [
+                    self.cwd or os.getcwd(),
+                    _PACKAGE_ROOT,
+                    env.get("PYTHONPATH"),
+                ],
+            )
+        )
+        launched = time.time()
+        try:
+            completed = subprocess.run(
+                self._command(),
+                capture_output=True,
+                text=True,
+                cwd=self.cwd,
+                env=env,
+                timeout=self.timeout + 30,
+            )
+        except subprocess.TimeoutExpired:
+            return ColdStartRun({}, "Timed out")
+
+        for line in reversed(completed.stdout.splitlines()):
+            if line.startswith(_MARKER):
+                report = json.loads(line.partition(_MARKER)[2])
+                break
+        else:
+            output = (completed.stderr or completed.stdout).strip()
+            tail = output.splitlines()[-1] if output else ""
+            return ColdStartRun(
+                {}, f"Exit code {completed.returncode}: {tail}"
+            )
+        if report.get("error"):
+            return ColdStartRun({}, report["error"])
+        phases = report["phases"]
+        # Interpreter start up and imports, then the measured phases. The
+        # server and interpreter shutting down are not counted.
+        phases["process"] = (report["started_at"] - launched) + sum(
+            phases.values()
+        )
+        return ColdStartRun(phases)
+
+    def run(self) -> ColdStartResult:
+        return ColdStartResult([self.run_once() for _ in range(self.runs)])
+
+
+def format_report(result: ColdStartResult) -> str:
+    header = ("PHASE", "MIN MS", "P50 MS", "P90 MS", "MAX MS")
+    rows = []
+    for name in PHASES:
+        latency = result.phase(name)
+        if not latency.count:
+            continue
+        rows.append(
+            (
+                name,
+                f"{latency.min * 1000:.3f}",
+                f"{latency.percentile(50) * 1000:.3f}",
+                f"{latency.percentile(90) * 1000:.3f}",
+                f"{latency.max * 1000:.3f}",
+            )
+        )
+    return render_table(header, rows)
+
+
+def _once(args) -> None:
+    report: Dict[str, Any] = {"started_at": time.time()}
+    try:
+        report["phases"] = measure(
+            args.target,
+            path=args.path,
+            factory=args.factory,
+            server=args.server,
+            timeout=args.timeout,
+        )
+    except BaseException as e:
+        report["error"] = repr(e)
+    print(_MARKER + json.dumps(report), flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m sanic_testing.coldstart",
+        description="Time cold starts of a Sanic app in fresh processes",
+    )
+    parser.add_argument("target", help="Path to the app, e.g. server:app")
+    parser.add_argument("--factory", action="store_true")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--server", choices=SERVERS, default="run")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.once:
+        _once(args)
+        return
+
+    result = ColdStartBenchmark(
+        args.target,
+        runs=args.runs,
+        path=args.path,
+        factory=args.factory,
+        server=args.server,
+        timeout=args.timeout,
+    ).run()
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2))
+        return
+    print(format_report(result))
+    for run in result.errors:
+        print(f"\nError: {run.error}")
+
+
+if __name__ == "__main__":
+    main()
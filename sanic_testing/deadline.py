@@ -0,0 +1,77 @@
+import asyncio
+import io
+import traceback
+from typing import Any, Awaitable, List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a request did not complete within its timeout. The message
+    includes the stacks of all pending tasks at the time it expired.
+    """
+
+    def __init__(self, message: str, tasks: str = "") -> None:
+        super().__init__(f"{message}\n\n{tasks}" if tasks else message)
+        self.tasks = tasks
+
+
+def is_deadline(timeout: Any) -> bool:
+    """A plain number of seconds, rather than an httpx.Timeout"""
+    return isinstance(timeout, (int, float)) and not isinstance(timeout, bool)
+
+
+def _await_chain(coro: Any) -> List[Any]:
+    # Task.get_stack() only has the outermost frame of a suspended task,
+    # so follow what each coroutine is awaiting down to the innermost one
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(
+            coro, "gi_frame", None
+        )
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(
+            coro, "gi_yieldfrom", None
+        )
+    return frames
+
+
+def format_tasks(exclude: Optional[asyncio.Task] = None) -> str:
+    """The await chains of all pending tasks on the running loop"""
+    output = io.StringIO()
+    tasks = [
+        task
+        for task in asyncio.all_tasks()
+        if task is not exclude and not task.done()
+    ]
+    output.write(f"{len(tasks)} pending task(s):\n")
+    for task in tasks:
+        output.write(f"\n{task!r}\n")
+        stack = traceback.StackSummary.extract(
+            iter(_await_chain(task.get_coro()))
+        )
+        output.writelines(stack.format())
+    return output.getvalue()
+
+
+async def run_with_deadline(
+    awaitable: Awaitable, timeout: Optional[float], description: str
+) -> Any:
+    """
+    Await with a timeout, raising DeadlineExceeded with a dump of the
+    pending tasks taken before the awaitable is cancelled
+    """
+    if timeout is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    if done:
+        return task.result()
+    tasks = format_tasks(exclude=asyncio.current_task())
+    task.cancel()
+    # Give the request a moment to unwind, without hanging on it
+    await asyncio.wait({task}, timeout=1)
+    raise DeadlineExceeded(
+        f"{description} did not complete within {timeout}s", tasks
+    )
@@ -0,0 +1,241 @@
+import asyncio
+import math
+from collections import Counter
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+from sanic_testing.reusable import ReusableClient
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def percentile(ordered: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not ordered:
+        return math.nan
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class LatencySummary:
+    """Distribution of a set of latency samples, in seconds"""
+
+    def __init__(self, samples: Iterable[float]) -> None:
+        self.samples: List[float] = sorted(samples)
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    @property
+    def min(self) -> float:
+        return self.samples[0] if self.samples else math.nan
+
+    @property
+    def max(self) -> float:
+        return self.samples[-1] if self.samples else math.nan
+
+    @property
+    def mean(self) -> float:
+        if not self.samples:
+            return math.nan
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, pct: float) -> float:
+        return percentile(self.samples, pct)
+
+    def as_dict(self) -> Dict[str, float]:
+        summary = {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.mean,
+            "max": self.max,
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}"] = self.percentile(pct)
+        return summary
+
+    def __repr__(self) -> str:
+        return (
+            f"<LatencySummary count={self.count} "
+            f"p50={self.percentile(50):.6f} p99={self.percentile(99):.6f} "
+            f"max={self.max:.6f}>"
+        )
+
+
+class LoadResult:
+    def __init__(
+        self,
+        scheduled: int,
+        duration: float,
+        latencies: List[float],
+        service_times: List[float],
+        statuses: Counter,
+        errors: List[BaseException],
+    ) -> None:
+        self.scheduled = scheduled
+        self.duration = duration
+        self.latency = LatencySummary(latencies)
+        self.service_time = LatencySummary(service_times)
+        self.statuses = statuses
+        self.errors = errors
+
+    @classmethod
+    def merge(cls, results: Iterable["LoadResult"]):
+        """Combine results of shards of the same load run concurrently"""
+        results = list(results)
+        statuses: Counter = Counter()
+        for result in results:
+            statuses.update(result.statuses)
+        return cls(
+            scheduled=sum(result.scheduled for result in results),
+            duration=max((result.duration for result in results), default=0),
+            latencies=[s for r in results for s in r.latency.samples],
+            service_times=[s for r in results for s in r.service_time.samples],
+            statuses=statuses,
+            errors=[e for result in results for e in result.errors],
+        )
+
+    @property
+    def completed(self) -> int:
+        return self.latency.count
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.duration if self.duration else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<LoadResult scheduled={self.scheduled} "
+            f"completed={self.completed} errors={len(self.errors)} "
+            f"latency={self.latency!r}>"
+        )
+
+
+def arrival_schedule(
+    rate: float, duration: float, ramp_to: Optional[float] = None
+) -> List[float]:
+    """
+    Offsets (in seconds from the start) at which requests should be sent
+    for a constant arrival rate, or a linear ramp from rate to ramp_to
+    """
+    if rate < 0 or (ramp_to is not None and ramp_to < 0):
+        raise ValueError("Arrival rates must not be negative")
+    end = rate if ramp_to is None else ramp_to
+    slope = (end - rate) / duration if duration else 0.0
+    total = int(rate * duration + slope * duration * duration / 2)
+
+    offsets = []
+    for i in range(total):
+        # Invert N(t) = rate * t + slope * t^2 / 2 for N(t) = i
+        if slope:
+            offset = (-rate + math.sqrt(rate * rate + 2 * slope * i)) / slope
+        else:
+            offset = i / rate
+        offsets.append(offset)
+    return offsets
+
+
+class OpenLoopLoad:
+    """
+    Open-loop load generator on top of a running ReusableClient
+
+    Requests are sent at the scheduled arrival times regardless of whether
+    earlier requests have completed. Latency is measured from the intended
+    send time, so that time spent queueing behind a slow server is not
+    hidden (coordinated omission). The time from the actual send is kept
+    separately as service_time.
+    """
+
+    def __init__(
+        self,
+        client: ReusableClient,
+        uri: str = "/",
+        rate: float = 100.0,
+        duration: float = 1.0,
+        ramp_to: Optional[float] = None,
+        method: str = "get",
+        **request_kwargs: Any,
+    ) -> None:
+        self.client = client
+        self.method = method
+        self.url = client._build_url(method, uri)
+        self.schedule = arrival_schedule(rate, duration, ramp_to)
+        self.request_kwargs = request_kwargs
+
+    def run(self) -> LoadResult:
+        return self.client._run(self.arun())
+
+    async def arun(self) -> LoadResult:
+        return await open_loop(
+            self.schedule,
+            partial(
+                self.client._local_request,
+                self.method,
+                self.url,
+                **self.request_kwargs,
+            ),
+        )
+
+
+async def open_loop(
+    schedule: Sequence[float],
+    send: Callable[[], Awaitable[Any]],
+    start: Optional[float] = None,
+) -> LoadResult:
+    """
+    Call send at each offset of the schedule without waiting for earlier
+    calls to complete. Offsets are relative to start, a loop.time() value
+    that defaults to now. send must return a response with a status_code.
+    """
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    service_times: List[float] = []
+    statuses: Counter = Counter()
+    errors: List[BaseException] = []
+
+    async def fire(intended: float):
+        sent = loop.time()
+        try:
+            response = await send()
+        except Exception as e:
+            errors.append(e)
+            return
+        done = loop.time()
+        if response is None:
+            errors.append(
+                ValueError("No response returned to Sanic Test Client.")
+            )
+            return
+        statuses[response.status_code] += 1
+        latencies.append(done - intended)
+        service_times.append(done - sent)
+
+    tasks = []
+    if start is None:
+        start = loop.time()
+    for offset in schedule:
+        intended = start + offset
+        delay = intended - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(loop.create_task(fire(intended)))
+    await asyncio.gather(*tasks)
+
+    return LoadResult(
+        scheduled=len(schedule),
+        duration=loop.time() - start,
+        latencies=latencies,
+        service_times=service_times,
+        statuses=statuses,
+        errors=errors,
+    )
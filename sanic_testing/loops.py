@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sanic_testing.load import LatencySummary, LoadResult
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+
+def _asyncio_loop() -> asyncio.AbstractEventLoop:
+    # Not asyncio.new_event_loop, which follows the installed policy and
+    # may already have been switched to uvloop by app.run
+    return asyncio.DefaultEventLoopPolicy().new_event_loop()
+
+
+def available_loop_factories() -> Dict[str, LoopFactory]:
+    """Event loop implementations that can be used in this environment"""
+    factories: Dict[str, LoopFactory] = {"asyncio": _asyncio_loop}
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        pass
+    else:
+        factories["uvloop"] = uvloop.new_event_loop
+    return factories
+
+
+def compare_loops(
+    benchmark: Callable[[LoopFactory], Any],
+    loops: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the same benchmark under each event loop implementation
+
+    The benchmark is called with a loop factory, which should be passed on
+    to the client as ``loop_factory=``, and its return value is collected
+    per loop name. For example::
+
+        def benchmark(loop_factory):
+            with ReusableClient(app, loop_factory=loop_factory) as client:
+                return OpenLoopLoad(client, rate=500, duration=5).run()
+
+        print(format_comparison(compare_loops(benchmark)))
+    """
+    factories = available_loop_factories()
+    names = list(loops) if loops is not None else list(factories)
+    missing = [name for name in names if name not in factories]
+    if missing:
+        raise ValueError(
+            f"Event loop(s) not available: {', '.join(missing)}. "
+            f"Available: {', '.join(factories)}"
+        )
+    return {name: benchmark(factories[name]) for name in names}
+
+
+def _describe(result: Any) -> str:
+    if isinstance(result, LoadResult):
+        return (
+            f"{result.throughput:10.1f} req/s  "
+            f"p50 {result.latency.percentile(50) * 1000:8.3f}ms  "
+            f"p99 {result.latency.percentile(99) * 1000:8.3f}ms  "
+            f"errors {len(result.errors)}"
+        )
+    if isinstance(result, LatencySummary):
+        return (
+            f"p50 {result.percentile(50) * 1000:8.3f}ms  "
+            f"p99 {result.percentile(99) * 1000:8.3f}ms  "
+            f"max {result.max * 1000:8.3f}ms"
+        )
+    if isinstance(result, float):
+        return f"{result:.6f}"
+    return str(result)
+
+
+def format_comparison(results: Dict[str, Any]) -> str:
+    width = max((len(name) for name in results), default=0)
+    return "\n".join(
+        f"{name:<{width}}  {_describe(result)}"
+        for name, result in results.items()
+    )
@@ -1,12 +1,23 @@
+import asyncio
+from typing import Callable, Optional
+
 from sanic import Sanic  # type: ignore
 
+from sanic_testing.monitor import LoopMonitor
 from sanic_testing.testing import SanicASGITestClient, SanicTestClient
 
 
 class TestManager:
     __test__ = False
 
-    def __init__(self, app: Sanic) -> None:
-        self.test_client = SanicTestClient(app)
-        self.asgi_client = SanicASGITestClient(app)
+    def __init__(
+        self,
+        app: Sanic,
+        loop_monitor: Optional[LoopMonitor] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+    ) -> None:
+        self.test_client = SanicTestClient(
+            app, loop_monitor=loop_monitor, loop_factory=loop_factory
+        )
+        self.asgi_client = SanicASGITestClient(app, loop_monitor=loop_monitor)
         app._test_manager = self  # type: ignore
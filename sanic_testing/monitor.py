@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from contextlib import asynccontextmanager
+from typing import List, MutableMapping, Optional
+
+
+class LoopBlockedError(Exception):
+    """Raised when a request blocked the event loop beyond the threshold"""
+
+
+class BlockEvent:
+    def __init__(self, duration: float, stack: Optional[str] = None) -> None:
+        self.duration = duration
+        self.stack = stack
+
+    def __repr__(self) -> str:
+        return f"<BlockEvent duration={self.duration:.3f}s>"
+
+    def __str__(self) -> str:
+        message = f"Event loop blocked for {self.duration:.3f}s"
+        if self.stack:
+            message += f" at:\n{self.stack}"
+        return message
+
+
+class SlowCallback:
+    def __init__(self, duration: float, callback: str) -> None:
+        self.duration = duration
+        self.callback = callback
+
+    def __repr__(self) -> str:
+        return f"<SlowCallback duration={self.duration:.3f}s>"
+
+    def __str__(self) -> str:
+        return f"{self.callback} took {self.duration:.3f}s"
+
+
+class _SlowCallbackHandler(logging.Handler):
+    def __init__(self, monitor: "LoopMonitor") -> None:
+        super().__init__()
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # asyncio debug mode logs "Executing %s took %.3f seconds"
+        if not str(record.msg).startswith("Executing") or not record.args:
+            return
+        args = record.args
+        if not isinstance(args, tuple) or len(args) != 2:
+            return
+        callback, duration = args
+        # Another monitor may have lowered the loop's threshold
+        if (
+            isinstance(duration, (int, float))
+            and duration >= self.monitor.threshold
+        ):
+            self.monitor.slow_callbacks.append(
+                SlowCallback(float(duration), str(callback))
+            )
+
+
+class _Watch:
+    """Heartbeat state of one watched request"""
+
+    def __init__(self) -> None:
+        self.last_beat = time.monotonic()
+        self.stack: Optional[str] = None
+
+
+class _LoopSettings:
+    """A loop's debug settings from before the first watch on it began"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.watches = 0
+        self.debug = loop.get_debug()
+        self.slow_callback_duration = loop.slow_callback_duration
+
+
+# Requests on the same loop can be watched at the same time, so the loop's
+# settings are changed by the first watch and restored by the last one
+_loop_settings: MutableMapping[asyncio.AbstractEventLoop, _LoopSettings] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class LoopMonitor:
+    """
+    Detect handlers that block the event loop while a request is processed
+
+    A heartbeat task measures how late the loop wakes it up, while a
+    watchdog thread captures the stack of the loop's thread as soon as a
+    heartbeat is overdue, pointing at the code that is blocking. asyncio's
+    own slow callback tracking (debug mode) is enabled for the duration of
+    each request as well.
+
+    Use ``fail=True`` to have the clients raise LoopBlockedError after any
+    request during which the loop was blocked for at least ``threshold``
+    seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        fail: bool = False,
+        interval: Optional[float] = None,
+        track_callbacks: bool = True,
+    ) -> None:
+        self.threshold = threshold
+        self.fail = fail
+        self.interval = interval or threshold / 4
+        self.track_callbacks = track_callbacks
+        self.events: List[BlockEvent] = []
+        self.slow_callbacks: List[SlowCallback] = []
+        self._unchecked: List[BlockEvent] = []
+        self._handler: Optional[_SlowCallbackHandler] = None
+        self._tracking = 0
+
+    @property
+    def max_lag(self) -> float:
+        return max((event.duration for event in self.events), default=0.0)
+
+    def reset(self) -> None:
+        self.events.clear()
+        self.slow_callbacks.clear()
+        self._unchecked.clear()
+
+    def check(self) -> None:
+        """Raise for blocks recorded since the previous check, if failing"""
+        events, self._unchecked = self._unchecked, []
+        if self.fail and events:
+            details = "\n\n".join(str(event) for event in events)
+            raise LoopBlockedError(
+                f"Event loop was blocked {len(events)} time(s) for longer "
+                f"than {self.threshold}s while handling the request:\n\n"
+                f"{details}"
+            )
+
+    @asynccontextmanager
+    async def watch(self):
+        loop = asyncio.get_running_loop()
+        thread_id = threading.get_ident()
+        stopped = threading.Event()
+        state = _Watch()
+
+        watchdog = threading.Thread(
+            target=self._watchdog,
+            args=(state, thread_id, stopped),
+            name="sanic-testing-loop-monitor",
+            daemon=True,
+        )
+        watchdog.start()
+        heartbeat = loop.create_task(self._heartbeat(state))
+
+        tracking = self.track_callbacks
+        if tracking:
+            self._start_tracking(loop)
+
+        try:
+            # Debug timing applies from the next loop iteration onward
+            await asyncio.sleep(0)
+            yield self
+        finally:
+            # End the current step so that asyncio reports its duration
+            # while we are still listening
+            await asyncio.sleep(0)
+            # A block that ended with the request has not been seen by the
+            # heartbeat yet
+            self._record(
+                state, time.monotonic() - state.last_beat - self.interval
+            )
+            heartbeat.cancel()
+            stopped.set()
+            watchdog.join()
+            if tracking:
+                self._stop_tracking(loop)
+
+    def _start_tracking(self, loop: asyncio.AbstractEventLoop) -> None:
+        settings = _loop_settings.get(loop)
+        if settings is None:
+            settings = _loop_settings[loop] = _LoopSettings(loop)
+            loop.slow_callback_duration = self.threshold
+        else:
+            loop.slow_callback_duration = min(
+                loop.slow_callback_duration, self.threshold
+            )
+        settings.watches += 1
+        loop.set_debug(True)
+
+        if self._handler is None:
+            self._handler = _SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._handler)
+        self._tracking += 1
+
+    def _stop_tracking(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._tracking -= 1
+        if not self._tracking and self._handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._handler = None
+
+        settings = _loop_settings[loop]
+        settings.watches -= 1
+        if not settings.watches:
+            del _loop_settings[loop]
+            loop.set_debug(settings.debug)
+            loop.slow_callback_duration = settings.slow_callback_duration
+
+    def _record(self, state: _Watch, lag: float) -> None:
+        if lag >= self.threshold:
+            event = BlockEvent(lag, state.stack)
+            self.events.append(event)
+            self._unchecked.append(event)
+        state.stack = None
+
+    async def _heartbeat(self, state: _Watch) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record(state, now - state.last_beat - self.interval)
+            state.last_beat = now
+
+    def _watchdog(
+        self, state: _Watch, thread_id: int, stopped: threading.Event
+    ) -> None:
+        while not stopped.wait(self.interval):
+            overdue = time.monotonic() - state.last_beat - self.interval
+            if overdue >= self.threshold and state.stack is None:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    state.stack = "".join(traceback.format_stack(frame))
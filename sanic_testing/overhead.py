@@ -0,0 +1,195 @@
+import time
+from functools import partial
+from inspect import isawaitable
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from sanic import Sanic
+from sanic.middleware import Middleware
+
+from sanic_testing._report import render_table
+from sanic_testing.load import LatencySummary
+
+
+class HookTiming:
+    """Time spent in one middleware or signal handler over a run"""
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.samples: List[float] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.samples)
+
+    @property
+    def total(self) -> float:
+        return sum(self.samples)
+
+    @property
+    def latency(self) -> LatencySummary:
+        return LatencySummary(self.samples)
+
+    def __repr__(self) -> str:
+        return (
+            f"<HookTiming {self.kind} {self.name} calls={self.calls} "
+            f"total={self.total:.6f}>"
+        )
+
+
+def _name(func: Callable) -> str:
+    while isinstance(func, partial):
+        func = func.func
+    module = getattr(func, "__module__", None) or ""
+    name = getattr(func, "__qualname__", None) or repr(func)
+    return f"{module}.{name}" if module else name
+
+
+def _is_internal(func: Callable) -> bool:
+    # The test clients add middleware and signal handlers of their own
+    while isinstance(func, partial):
+        func = func.func
+    module = getattr(func, "__module__", None) or ""
+    return module.startswith("sanic_testing")
+
+
+class MiddlewareProfiler:
+    """
+    Time every request and response middleware and every signal handler
+    of an app, across all the requests made while it is installed
+
+    Each hook is wrapped in place, including middleware that only applies
+    to some routes, and wrapped again whenever the server starts, since
+    starting rebuilds the per-route middleware. Time includes any awaits
+    inside the hook. Middleware and handlers of the test clients
+    themselves are left out.
+    """
+
+    def __init__(self, app: Sanic) -> None:
+        self.app = app
+        self.installed = False
+        self._listening = False
+        self._timings: Dict[Tuple[str, str], HookTiming] = {}
+
+    def __enter__(self) -> "MiddlewareProfiler":
+        self.install()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.uninstall()
+
+    @property
+    def timings(self) -> List[HookTiming]:
+        """Hooks that were called, the most expensive in total first"""
+        return sorted(
+            (timing for timing in self._timings.values() if timing.calls),
+            key=lambda timing: timing.total,
+            reverse=True,
+        )
+
+    def reset(self) -> None:
+        for timing in self._timings.values():
+            timing.samples.clear()
+
+    def install(self) -> None:
+        # Listeners cannot be added to a running server, which will not be
+        # starting again anyway
+        if not self._listening and not self.app.signal_router.finalized:
+            self._listening = True
+            self.app.before_server_start(self._rewrap)
+        self.installed = True
+        self._apply(self._wrap)
+
+    def uninstall(self) -> None:
+        self.installed = False
+        self._apply(self._unwrap)
+
+    async def _rewrap(self, *_) -> None:
+        if self.installed:
+            self._apply(self._wrap)
+
+    def _collections(self) -> Iterable[Tuple[str, Any]]:
+        app = self.app
+        yield "request middleware", app.request_middleware
+        yield "response middleware", app.response_middleware
+        for collection in app.named_request_middleware.values():
+            yield "request middleware", collection
+        for collection in app.named_response_middleware.values():
+            yield "response middleware", collection
+        for route in app.router.routes:
+            # Built from the above when the server starts
+            extra = route.extra
+            yield "request middleware", getattr(
+                extra, "request_middleware", None
+            ) or ()
+            yield "response middleware", getattr(
+                extra, "response_middleware", None
+            ) or ()
+
+    def _apply(self, change: Callable[[str, Callable], Callable]) -> None:
+        for kind, collection in self._collections():
+            for index, middleware in enumerate(collection):
+                if isinstance(middleware, Middleware):
+                    middleware.func = change(kind, middleware.func)
+                else:
+                    collection[index] = change(kind, middleware)
+        for signal in self.app.signal_router.routes:
+            if signal.ctx.definition.startswith("server."):
+                # Listeners, which run at startup and shutdown only
+                continue
+            kind = f"signal {signal.ctx.definition}"
+            signal.handler = change(kind, signal.handler)
+
+    def _wrap(self, kind: str, func: Callable) -> Callable:
+        if getattr(func, "__profiled__", False) or _is_internal(func):
+            return func
+        key = (kind, _name(func))
+        timing = self._timings.get(key)
+        if timing is None:
+            timing = self._timings[key] = HookTiming(*key)
+        samples = timing.samples
+
+        async def finish(start, result):
+            try:
+                return await result
+            finally:
+                samples.append(time.perf_counter() - start)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            if isawaitable(result):
+                return finish(start, result)
+            samples.append(time.perf_counter() - start)
+            return result
+
+        timed.__profiled__ = True  # type: ignore
+        timed.__wrapped__ = func  # type: ignore
+        return timed
+
+    @staticmethod
+    def _unwrap(kind: str, func: Callable) -> Callable:
+        if getattr(func, "__profiled__", False):
+            return func.__wrapped__  # type: ignore
+        return func
+
+    def report(self) -> str:
+        return format_report(self.timings)
+
+
+def format_report(timings: Iterable[HookTiming]) -> str:
+    header = ("KIND", "NAME", "CALLS", "TOTAL MS", "MEAN MS", "P99 MS")
+    rows = []
+    for timing in timings:
+        latency = timing.latency
+        rows.append(
+            (
+                timing.kind,
+                timing.name,
+                str(timing.calls),
+                f"{timing.total * 1000:.3f}",
+                f"{latency.mean * 1000:.3f}",
+                f"{latency.percentile(99) * 1000:.3f}",
+            )
+        )
+    return render_table(header, rows)
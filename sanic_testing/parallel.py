@@ -0,0 +1,292 @@
+import asyncio
+import os
+import pickle
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpx
+from sanic import Sanic
+
+from sanic_testing._specs import RequestSpec, normalize_request
+from sanic_testing.load import (
+    LatencySummary,
+    LoadResult,
+    arrival_schedule,
+    open_loop,
+)
+from sanic_testing.testing import (
+    ASGI_BASE_URL,
+    ASGI_HOST,
+    ASGI_PORT,
+    SanicASGITestClient,
+)
+
+Target = Union[str, Sanic, SanicASGITestClient, Callable[[], Sanic]]
+
+# Set in each worker process by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+class ResponseRecord:
+    """A response as sent back from a worker process"""
+
+    def __init__(
+        self,
+        index: int,
+        status: Optional[int],
+        headers: Dict[str, str],
+        body: bytes,
+        latency: float,
+        error: Optional[str] = None,
+    ) -> None:
+        self.index = index
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.latency = latency
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"<ResponseRecord index={self.index} status={self.status}>"
+
+
+class BatchResult:
+    def __init__(self, records: List[ResponseRecord]) -> None:
+        self.records = records
+        self.latency = LatencySummary(
+            record.latency for record in records if record.error is None
+        )
+        self.statuses: Counter = Counter(
+            record.status for record in records if record.error is None
+        )
+        self.errors = [record for record in records if record.error]
+
+    def __repr__(self) -> str:
+        return (
+            f"<BatchResult requests={len(self.records)} "
+            f"errors={len(self.errors)} latency={self.latency!r}>"
+        )
+
+
+def _portable(error: BaseException) -> BaseException:
+    # Exceptions travel back to the parent process pickled
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return RuntimeError(repr(error))
+    return error
+
+
+def _load_app(target: Target) -> Sanic:
+    if isinstance(target, SanicASGITestClient):
+        return target.sanic_app
+    if isinstance(target, Sanic):
+        return target
+    if isinstance(target, str):
+        from sanic.worker.loader import AppLoader
+
+        return AppLoader(target).load()
+    return target()
+
+
+def _init_worker(target: Target, concurrency: int) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    _worker["loop"] = loop
+    _worker["semaphore"] = asyncio.Semaphore(concurrency)
+    if isinstance(target, str) and target.startswith(("http:", "https:")):
+        session = httpx.AsyncClient(
+            base_url=target,
+            verify=False,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+    else:
+        app = _load_app(target)
+        loop.run_until_complete(_startup(app))
+        transport = httpx.ASGITransport(
+            app=app, client=(ASGI_HOST, ASGI_PORT)  # type: ignore
+        )
+        session = httpx.AsyncClient(
+            transport=transport, base_url=ASGI_BASE_URL
+        )
+    _worker["session"] = session
+
+
+async def _startup(app: Sanic) -> None:
+    # Once per worker, rather than per request as SanicASGITestClient does
+    Sanic.test_mode = True
+    app.asgi = True
+    app.router.reset()
+    app.signal_router.reset()
+    await app._startup()  # type: ignore
+    await app._server_event("init", "before")
+    await app._server_event("init", "after")
+
+
+async def _send(method: str, uri: str, kwargs: Dict[str, Any]):
+    async with _worker["semaphore"]:
+        return await _worker["session"].request(method, uri, **kwargs)
+
+
+async def _batch(
+    specs: Sequence[Tuple[int, Tuple[str, str, Dict[str, Any]]]],
+) -> List[ResponseRecord]:
+    async def one(index, method, uri, kwargs):
+        start = time.perf_counter()
+        try:
+            response = await _send(method, uri, kwargs)
+        except Exception as e:
+            return ResponseRecord(
+                index, None, {}, b"", time.perf_counter() - start, repr(e)
+            )
+        return ResponseRecord(
+            index,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            time.perf_counter() - start,
+        )
+
+    return list(
+        await asyncio.gather(*(one(index, *spec) for index, spec in specs))
+    )
+
+
+def _run_batch(specs):
+    return _worker["loop"].run_until_complete(_batch(specs))
+
+
+def _run_shard(
+    schedule: List[float],
+    start_at: float,
+    method: str,
+    uri: str,
+    kwargs: Dict[str, Any],
+) -> LoadResult:
+    async def shard():
+        loop = asyncio.get_running_loop()
+        # start_at is wall clock time shared by all workers
+        start = loop.time() + max(start_at - time.time(), 0)
+        return await open_loop(
+            schedule,
+            lambda: _worker["session"].request(method, uri, **kwargs),
+            start,
+        )
+
+    result = _worker["loop"].run_until_complete(shard())
+    result.errors = [_portable(error) for error in result.errors]
+    return result
+
+
+class ProcessPoolRunner:
+    """
+    Send requests from a pool of worker processes, so that the client is
+    not limited to a single core
+
+    The target is one of:
+
+    - A URL of a running server, such as a multi-worker Sanic server
+    - An app factory, or a "module:app" string as accepted by the sanic
+      CLI, to build the app in each worker and call it through ASGI
+    - A Sanic app or a SanicASGITestClient, called through ASGI. Sanic
+      apps cannot be pickled, so these require the "fork" start method,
+      the default on Linux.
+
+    Each worker keeps up to ``concurrency`` requests in flight. Results
+    are sent back to the parent and merged.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        processes: Optional[int] = None,
+        concurrency: int = 10,
+        mp_context=None,
+    ) -> None:
+        Sanic.test_mode = True
+        self.target = target
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ProcessPoolRunner":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(self.target, self.concurrency),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def map(self, requests: Iterable[RequestSpec]) -> BatchResult:
+        """
+        Send every request once and return the responses in order
+
+        A request is a path, a (method, path) tuple, or a
+        (method, path, kwargs) tuple where kwargs are passed to httpx.
+        """
+        specs = list(enumerate(normalize_request(spec) for spec in requests))
+        step = self.processes
+        shards = [specs[i::step] for i in range(step)]
+        records: List[ResponseRecord] = []
+        for shard in self.executor.map(_run_batch, filter(None, shards)):
+            records.extend(shard)
+        records.sort(key=lambda record: record.index)
+        return BatchResult(records)
+
+    def load(
+        self,
+        uri: str = "/",
+        rate: float = 100.0,
+        duration: float = 1.0,
+        ramp_to: Optional[float] = None,
+        method: str = "get",
+        warmup: float = 1.0,
+        **request_kwargs: Any,
+    ) -> LoadResult:
+        """
+        Run an open-loop load (see OpenLoopLoad) with the arrivals dealt
+        out across the workers. All workers start at the same time, after
+        ``warmup`` seconds to let the pool start.
+        """
+        schedule = arrival_schedule(rate, duration, ramp_to)
+        start_at = time.time() + warmup
+        step = self.processes
+        futures = [
+            self.executor.submit(
+                _run_shard,
+                schedule[i::step],
+                start_at,
+                method.upper(),
+                uri,
+                request_kwargs,
+            )
+            for i in range(step)
+        ]
+        return LoadResult.merge(future.result() for future in futures)
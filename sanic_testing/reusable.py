@@ -2,7 +2,16 @@ import asyncio
 import typing
 from functools import partial
 from random import randint
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import httpx
 from sanic import Sanic
@@ -10,9 +19,33 @@ from sanic.application.state import ApplicationServerInfo
 from sanic.log import logger
 from sanic.request import Request
 
+from sanic_testing.assertions import verify_all
+from sanic_testing.clock import VirtualClockEventLoop
+from sanic_testing.deadline import is_deadline, run_with_deadline
+from sanic_testing.monitor import LoopMonitor
+from sanic_testing.tls import LocalTLS
 from sanic_testing.websocket import websocket_proxy
 
-from .testing import HOST, PORT, TestingResponse
+from .testing import (
+    _WIRE_TRANSPORT_CONFLICT,
+    HOST,
+    PORT,
+    TestingResponse,
+    _app_loads,
+    _as_testing_response,
+    _stream_request,
+)
+
+if TYPE_CHECKING:
+    from sanic_testing.wire import WireStats
+
+_TLS_TRANSPORT_CONFLICT = (
+    "tls=True sends requests through a transport of its own, which trusts "
+    "the throwaway certificate authority and records handshakes, and "
+    "cannot use a transport that is passed in. Serve with "
+    "LocalTLS().server_context and pass LocalTLS().client_context to your "
+    "transport as verify= instead."
+)
 
 
 class ReusableClient:
@@ -24,12 +57,29 @@ class ReusableClient:
         loop=None,
         server_kwargs=None,
         client_kwargs=None,
+        loop_monitor: Optional[LoopMonitor] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        track_wire: bool = False,
+        tls: Union[bool, LocalTLS] = False,
+        resume_tls_sessions: bool = True,
+        virtual_clock: bool = False,
+        json_loads: Optional[Callable[..., Any]] = None,
     ):
+        if "transport" in (client_kwargs or {}):
+            if track_wire:
+                raise ValueError(_WIRE_TRANSPORT_CONFLICT)
+            if tls:
+                raise ValueError(_TLS_TRANSPORT_CONFLICT)
+        if virtual_clock:
+            loop_factory = VirtualClockEventLoop
         if not loop:
-            loop = asyncio.new_event_loop()
+            loop = (loop_factory or asyncio.new_event_loop)()
             asyncio.set_event_loop(loop)
         server_kwargs = server_kwargs or {}
         client_kwargs = client_kwargs or {}
+        if virtual_clock:
+            # Network timeouts would expire as soon as a handler sleeps
+            client_kwargs.setdefault("timeout", None)
 
         Sanic.test_mode = True
         self.app = app
@@ -37,12 +87,17 @@ class ReusableClient:
         self.port = port or randint(5000, 65000)
         self._loop = loop
         self.debug = False
+        self.loop_monitor = loop_monitor
+        self.json_loads = json_loads or _app_loads(app)
         self._server = None
+        self.tls = LocalTLS() if tls is True else tls or None
+        if self.tls:
+            server_kwargs.setdefault("ssl", self.tls.server_context)
         self.app.state.server_info.append(
             ApplicationServerInfo(
                 settings={
                     "version": "1.1",
-                    "ssl": None,
+                    "ssl": server_kwargs.get("ssl"),
                     "unix": None,
                     "sock": None,
                     "loop": None,
@@ -52,6 +107,18 @@ class ReusableClient:
             )
         )
 
+        self.wire_stats: Optional["WireStats"] = None
+        if self.tls or track_wire:
+            # Imported here, as sanic_testing.wire needs a newer httpcore.
+            # Handshake metrics come from the wire level accounting.
+            from sanic_testing import wire
+
+            self.wire_stats = wire.WireStats()
+            client_kwargs["transport"] = wire.wire_transport(
+                self.wire_stats,
+                resume_tls_sessions=resume_tls_sessions,
+                verify=self.tls.client_context if self.tls else False,
+            )
         self._session = httpx.AsyncClient(verify=False, **client_kwargs)
         self._server_co = self.app.create_server(
             host=self.host,
@@ -92,6 +159,12 @@ class ReusableClient:
 
         self._run(self.app._server_event("shutdown", "after", loop=self._loop))
 
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward (see virtual_clock)"""
+        if not isinstance(self._loop, VirtualClockEventLoop):
+            raise RuntimeError("The client does not use a virtual clock")
+        self._loop.advance(seconds)
+
     def _sanic_endpoint_test(
         self,
         method: str = "get",
@@ -119,26 +192,36 @@ class ReusableClient:
                 if _collect_request not in route.extra.request_middleware:
                     route.extra.request_middleware.appendleft(_collect_request)
 
-        if uri.startswith(
-            ("http:", "https:", "ftp:", "ftps://", "//", "ws:", "wss:")
-        ):
-            url = uri
-        else:
-            uri = uri if uri.startswith("/") else f"/{uri}"
-            scheme = "ws" if method == "websocket" else "http"
-            url = f"{scheme}://{host}:{port}{uri}"
+        url = self._build_url(method, uri, host, port)
 
         if exceptions:
             raise ValueError(f"Exception during request: {exceptions}")
 
-        response = self._run(
-            self._local_request(method, url, *request_args, **request_kwargs)
-        )
+        timeout = request_kwargs.get("timeout")
+        if is_deadline(timeout):
+            # The deadline covers the whole request instead
+            request_kwargs["timeout"] = None
+        else:
+            timeout = None
 
         try:
-            self.app.request_middleware.remove(_collect_request)  # type: ignore  # noqa
-        except BaseException:  # noqa
-            pass
+            response = self._run(
+                run_with_deadline(
+                    self._monitored_request(
+                        method, url, *request_args, **request_kwargs
+                    ),
+                    timeout,
+                    f"{method.upper()} {url}",
+                )
+            )
+        finally:
+            if gather_request:
+                self._remove_collector(_collect_request)
+
+        if self.loop_monitor:
+            self.loop_monitor.check()
+
+        verify_all(getattr(response, "body_checks", None))
 
         try:
             request = request_data.get("request") if gather_request else None
@@ -157,8 +240,45 @@ class ReusableClient:
 
         return None, None
 
+    def _remove_collector(self, collector) -> None:
+        # Left in place, a collector per request would pile up in the
+        # route middleware and run on every later request
+        collections = [self.app.request_middleware]
+        collections.extend(
+            route.extra.request_middleware for route in self.app.router.routes
+        )
+        for collection in collections:
+            try:
+                collection.remove(collector)
+            except ValueError:
+                pass
+
+    def _build_url(
+        self,
+        method: str,
+        uri: str,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+    ) -> str:
+        if uri.startswith(
+            ("http:", "https:", "ftp:", "ftps://", "//", "ws:", "wss:")
+        ):
+            return uri
+        uri = uri if uri.startswith("/") else f"/{uri}"
+        scheme = "ws" if method == "websocket" else "http"
+        if self.tls:
+            scheme += "s"
+        return f"{scheme}://{host or self.host}:{port or self.port}{uri}"
+
+    async def _monitored_request(self, method, url, *args, **kwargs):
+        if not self.loop_monitor:
+            return await self._local_request(method, url, *args, **kwargs)
+        async with self.loop_monitor.watch():
+            return await self._local_request(method, url, *args, **kwargs)
+
     async def _local_request(self, method, url, *args, **kwargs):
         raw_cookies = kwargs.pop("raw_cookies", None)
+        body_checks = kwargs.pop("body_checks", None)
 
         if method == "websocket":
             return await websocket_proxy(url, *args, **kwargs)
@@ -167,10 +287,14 @@ class ReusableClient:
 
             try:
                 if method == "request":
-                    args = tuple([url] + list(args))
-                    url = kwargs.pop("http_method", "GET").upper()
-                response = await getattr(session, method.lower())(
-                    url, *args, **kwargs
+                    method = kwargs.pop("http_method", "GET")
+                response = await _stream_request(
+                    session,
+                    method,
+                    url,
+                    *args,
+                    body_checks=body_checks,
+                    **kwargs,
                 )
             except httpx.HTTPError as e:
                 if hasattr(e, "response"):
@@ -182,7 +306,10 @@ class ReusableClient:
                     )
                     return None
 
-            response.__class__ = TestingResponse
+            response = _as_testing_response(response, self.json_loads)
+
+            if self.wire_stats is not None:
+                response.wire = self.wire_stats.record(response)
 
             if raw_cookies:
                 response.raw_cookies = {}
@@ -0,0 +1,246 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sanic_testing._report import render_table
+from sanic_testing._specs import RequestSpec, normalize_request
+from sanic_testing.load import LatencySummary
+from sanic_testing.reusable import ReusableClient
+
+DEFAULT_LEVELS = (1, 2, 4, 8, 16, 32)
+
+
+def _default_key(response) -> Tuple[int, bytes]:
+    return response.status_code, response.content
+
+
+class Divergence:
+    """A response under concurrency that differs from the serial one"""
+
+    def __init__(
+        self,
+        concurrency: int,
+        index: int,
+        method: str,
+        uri: str,
+        expected: Any,
+        actual: Any,
+    ) -> None:
+        self.concurrency = concurrency
+        self.index = index
+        self.method = method
+        self.uri = uri
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self) -> str:
+        return (
+            f"<Divergence concurrency={self.concurrency} {self.method} "
+            f"{self.uri} expected={self.expected!r} actual={self.actual!r}>"
+        )
+
+
+class LevelResult:
+    def __init__(
+        self,
+        concurrency: int,
+        requests: int,
+        duration: float,
+        latencies: List[float],
+        divergences: List[Divergence],
+        errors: List[BaseException],
+    ) -> None:
+        self.concurrency = concurrency
+        self.requests = requests
+        self.duration = duration
+        self.latency = LatencySummary(latencies)
+        self.divergences = divergences
+        self.errors = errors
+
+    @property
+    def throughput(self) -> float:
+        return self.latency.count / self.duration if self.duration else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<LevelResult concurrency={self.concurrency} "
+            f"throughput={self.throughput:.1f} "
+            f"divergences={len(self.divergences)} errors={len(self.errors)}>"
+        )
+
+
+class StressResult:
+    def __init__(
+        self,
+        levels: List[LevelResult],
+        unstable: List[int],
+        tolerance: float = 0.1,
+    ) -> None:
+        self.levels = levels
+        self.unstable = unstable
+        self.tolerance = tolerance
+
+    @property
+    def divergences(self) -> List[Divergence]:
+        return [d for level in self.levels for d in level.divergences]
+
+    @property
+    def diverged(self) -> bool:
+        return bool(self.divergences)
+
+    @property
+    def peak(self) -> Optional[LevelResult]:
+        """The concurrency level with the highest throughput"""
+        return max(
+            self.levels, key=lambda level: level.throughput, default=None
+        )
+
+    @property
+    def degrades_at(self) -> Optional[LevelResult]:
+        """
+        The first level above the peak whose throughput fell more than
+        ``tolerance`` below it, if any
+        """
+        peak = self.peak
+        if peak is None:
+            return None
+        floor = peak.throughput * (1 - self.tolerance)
+        for level in self.levels:
+            if level.concurrency > peak.concurrency:
+                if level.throughput < floor:
+                    return level
+        return None
+
+    def __repr__(self) -> str:
+        peak = self.peak
+        return (
+            f"<StressResult levels={len(self.levels)} "
+            f"divergences={len(self.divergences)} "
+            f"peak={peak.concurrency if peak else None}>"
+        )
+
+
+class ConcurrencyStress:
+    """
+    Look for handlers that share state between requests, such as values
+    kept on app.ctx, on top of a running ReusableClient
+
+    The request sequence is first sent serially, twice. Responses that
+    differ between those two runs are marked unstable and not compared.
+    Then, for each concurrency level, that many clients send the sequence
+    at the same time, ``rounds`` times each, and every response is
+    compared with the serial response to the same request. ``key`` picks
+    what is compared, by default the status and the body.
+
+    A request is a path, a (method, path) tuple, or a (method, path,
+    kwargs) tuple where kwargs are passed to httpx.
+    """
+
+    def __init__(
+        self,
+        client: ReusableClient,
+        requests: Iterable[RequestSpec],
+        levels: Iterable[int] = DEFAULT_LEVELS,
+        rounds: int = 1,
+        tolerance: float = 0.1,
+        key: Callable[[Any], Any] = _default_key,
+    ) -> None:
+        self.client = client
+        self.requests = [
+            (method, client._build_url(method, uri), uri, kwargs)
+            for method, uri, kwargs in map(normalize_request, requests)
+        ]
+        self.levels = sorted(set(levels))
+        self.rounds = rounds
+        self.tolerance = tolerance
+        self.key = key
+
+    def run(self) -> StressResult:
+        return self.client._run(self.arun())
+
+    async def _send(self, index: int) -> Any:
+        method, url, _, kwargs = self.requests[index]
+        response = await self.client._local_request(method, url, **kwargs)
+        if response is None:
+            raise ValueError("No response returned to Sanic Test Client.")
+        return self.key(response)
+
+    async def _serial(self) -> List[Any]:
+        return [await self._send(i) for i in range(len(self.requests))]
+
+    async def _level(
+        self, concurrency: int, baseline: Dict[int, Any]
+    ) -> LevelResult:
+        loop = asyncio.get_running_loop()
+        latencies: List[float] = []
+        divergences: List[Divergence] = []
+        errors: List[BaseException] = []
+
+        async def user():
+            for _ in range(self.rounds):
+                for index in range(len(self.requests)):
+                    start = loop.time()
+                    try:
+                        observed = await self._send(index)
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    latencies.append(loop.time() - start)
+                    if index in baseline and observed != baseline[index]:
+                        method, _, uri, _ = self.requests[index]
+                        divergences.append(
+                            Divergence(
+                                concurrency,
+                                index,
+                                method,
+                                uri,
+                                baseline[index],
+                                observed,
+                            )
+                        )
+
+        start = loop.time()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return LevelResult(
+            concurrency,
+            concurrency * self.rounds * len(self.requests),
+            loop.time() - start,
+            latencies,
+            divergences,
+            errors,
+        )
+
+    async def arun(self) -> StressResult:
+        first = await self._serial()
+        second = await self._serial()
+        unstable = [i for i, (a, b) in enumerate(zip(first, second)) if a != b]
+        baseline = {
+            i: observed
+            for i, observed in enumerate(first)
+            if i not in unstable
+        }
+        levels = [await self._level(n, baseline) for n in self.levels]
+        return StressResult(levels, unstable, self.tolerance)
+
+
+def format_report(result: StressResult) -> str:
+    header = ("CONCURRENCY", "REQUESTS", "REQ/S", "P50 MS", "P99 MS", "DIFF")
+    rows = []
+    peak = result.peak
+    degraded = result.degrades_at
+    for level in result.levels:
+        note = ""
+        if level is peak:
+            note = "  peak"
+        elif level is degraded:
+            note = "  degraded"
+        rows.append(
+            (
+                str(level.concurrency),
+                str(level.requests),
+                f"{level.throughput:.1f}",
+                f"{level.latency.percentile(50) * 1000:.3f}",
+                f"{level.latency.percentile(99) * 1000:.3f}",
+                f"{len(level.divergences)}{note}",
+            )
+        )
+    return render_table(header, rows)
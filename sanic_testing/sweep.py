@@ -0,0 +1,260 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+from sanic import Sanic
+from sanic_routing.patterns import REGEX_PARAM_NAME
+
+from sanic_testing._report import render_table
+from sanic_testing.load import LatencySummary
+from sanic_testing.testing import ASGI_BASE_URL, ASGI_HOST, ASGI_PORT
+
+SAMPLE_VALUES: Dict[str, str] = {
+    "str": "test",
+    "strorempty": "test",
+    "slug": "test-slug",
+    "alpha": "test",
+    "path": "test/path",
+    "int": "1",
+    "float": "1.5",
+    "ymd": "2020-01-01",
+    "uuid": "12345678-1234-5678-1234-567812345678",
+}
+
+
+class RouteTiming:
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        statuses: List[int],
+        sizes: List[int],
+        latencies: List[float],
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.name = name
+        self.method = method
+        self.path = path
+        self.statuses = statuses
+        self.sizes = sizes
+        self.latency = LatencySummary(latencies)
+        self.error = error
+
+    @property
+    def status(self) -> Optional[int]:
+        return self.statuses[-1] if self.statuses else None
+
+    @property
+    def size(self) -> Optional[int]:
+        return self.sizes[-1] if self.sizes else None
+
+    def __repr__(self) -> str:
+        return f"<RouteTiming {self.method} {self.path} status={self.status}>"
+
+
+def _sample_value(param) -> Optional[str]:
+    ctx = param.ctx
+    if hasattr(ctx, "allowed"):
+        # <name:ext> and <name=type:ext=a|b>
+        stem = "test"
+        if ctx.cast is not None:
+            for label, value in SAMPLE_VALUES.items():
+                try:
+                    ctx.cast(value)
+                except ValueError:
+                    continue
+                if label not in ("path", "strorempty"):
+                    stem = value
+                    break
+        extension = ctx.allowed[0] if ctx.allowed else "txt"
+        return f"{stem}.{extension}"
+
+    if not param.regex and param.label in SAMPLE_VALUES:
+        return SAMPLE_VALUES[param.label]
+
+    # Regex and custom pattern types: use the first sample that matches
+    candidates = list(SAMPLE_VALUES.values()) + ["a", "abc", "0", "test.txt"]
+    for value in candidates:
+        if param.pattern.match(value):
+            return value
+    return None
+
+
+def synthesize_path(route, overrides: Optional[Dict[str, str]] = None):
+    """
+    Build a concrete path for a route by filling each path parameter with
+    a value that matches its type, or None when no value can be found
+    """
+    overrides = overrides or {}
+    params = {param.name: param for param in route.params.values()}
+    parts = []
+    for segment in route.raw_path.split("/"):
+        match = REGEX_PARAM_NAME.match(segment)
+        if not match:
+            parts.append(segment)
+            continue
+        name = match.group(1)
+        value: Optional[str]
+        if name in overrides:
+            value = overrides[name]
+        else:
+            param = params.get(name)
+            value = _sample_value(param) if param else None
+        if value is None:
+            return None
+        parts.append(value)
+    return "/" + "/".join(parts)
+
+
+class RouteSweep:
+    """
+    Request every route in app.router.routes through the ASGI app and
+    record latency, status and response size per route and method
+
+    Path parameters are filled from their types. Use ``params`` to provide
+    values for specific routes, keyed by route name and then parameter
+    name. Routes whose parameters cannot be filled, and websocket routes,
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        app: Sanic,
+        concurrency: int = 10,
+        repeat: int = 1,
+        methods: Optional[Iterable[str]] = None,
+        params: Optional[Dict[str, Dict[str, str]]] = None,
+        **request_kwargs: Any,
+    ) -> None:
+        self.app = app
+        self.concurrency = concurrency
+        self.repeat = repeat
+        self.methods = {m.upper() for m in methods} if methods else None
+        self.params = params or {}
+        self.request_kwargs = request_kwargs
+        self.skipped: List[str] = []
+
+    def _targets(self):
+        self.skipped = []
+        for route in sorted(self.app.router.routes, key=lambda r: r.path):
+            if route.extra.websocket:
+                self.skipped.append(route.name)
+                continue
+            path = synthesize_path(route, self.params.get(route.name))
+            if path is None:
+                self.skipped.append(route.name)
+                continue
+            headers = {}
+            hosts = [host for host in route.extra.hosts or () if host]
+            if hosts:
+                headers["host"] = hosts[0]
+            for method in sorted(route.methods):
+                if self.methods is None or method in self.methods:
+                    yield route.name, method, path, headers
+
+    def run(self) -> List[RouteTiming]:
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.arun())
+        finally:
+            loop.close()
+
+    async def arun(self) -> List[RouteTiming]:
+        app = self.app
+        Sanic.test_mode = True
+        app.asgi = True
+        app.router.reset()
+        app.signal_router.reset()
+        await app._startup()  # type: ignore
+        await app._server_event("init", "before")
+        await app._server_event("init", "after")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        transport = httpx.ASGITransport(
+            app=app, client=(ASGI_HOST, ASGI_PORT)  # type: ignore
+        )
+
+        async def fire(session, name, method, path, headers):
+            statuses, sizes, latencies = [], [], []
+            error = None
+            for _ in range(self.repeat):
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        response = await session.request(
+                            method,
+                            path,
+                            headers=headers,
+                            **self.request_kwargs,
+                        )
+                    except Exception as e:
+                        error = e
+                        break
+                    latencies.append(time.perf_counter() - start)
+                statuses.append(response.status_code)
+                sizes.append(len(response.content))
+            return RouteTiming(
+                name, method, path, statuses, sizes, latencies, error
+            )
+
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url=ASGI_BASE_URL
+            ) as session:
+                return list(
+                    await asyncio.gather(
+                        *(fire(session, *target) for target in self._targets())
+                    )
+                )
+        finally:
+            await app._server_event("shutdown", "before")
+            await app._server_event("shutdown", "after")
+
+
+def format_table(timings: Iterable[RouteTiming]) -> str:
+    header = ("METHOD", "PATH", "STATUS", "BYTES", "P50 MS", "MAX MS")
+    rows = []
+    for timing in sorted(
+        timings,
+        key=lambda t: t.latency.percentile(50) if t.latency.count else -1.0,
+        reverse=True,
+    ):
+        rows.append(
+            (
+                timing.method,
+                timing.path,
+                str(timing.status) if timing.error is None else "ERROR",
+                str(timing.size if timing.size is not None else "-"),
+                f"{timing.latency.percentile(50) * 1000:.3f}",
+                f"{timing.latency.max * 1000:.3f}",
+            )
+        )
+    return render_table(header, rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    from sanic.worker.loader import AppLoader
+
+    parser = argparse.ArgumentParser(
+        prog="python -m sanic_testing.sweep",
+        description="Request every route of a Sanic app and time it",
+    )
+    parser.add_argument("target", help="Path to the app, e.g. server:app")
+    parser.add_argument("--factory", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    app = AppLoader(args.target, as_factory=args.factory).load()
+    sweep = RouteSweep(app, concurrency=args.concurrency, repeat=args.repeat)
+    print(format_table(sweep.run()))
+    if sweep.skipped:
+        print(f"\nSkipped: {', '.join(sweep.skipped)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import asyncio
+import typing
+from typing import Callable, Optional, Tuple
+
+from sanic import Sanic
+from sanic.request import Request
+
+from .clock import VirtualClockEventLoop
+from .monitor import LoopMonitor
+from .testing import ASGI_BASE_URL, SanicASGITestClient, TestingResponse
+
+
+class SyncASGITestClient:
+    """
+    Synchronous facade over SanicASGITestClient
+
+    Requests are dispatched in-process to the ASGI app (no sockets, no
+    server boot) on a single event loop owned by the client, so that
+    sync test suites get the same call signature as SanicTestClient.
+    """
+
+    __test__ = False
+
+    def __init__(
+        self,
+        app: Sanic,
+        base_url: str = ASGI_BASE_URL,
+        suppress_exceptions: bool = False,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        virtual_clock: bool = False,
+        json_loads: Optional[Callable[..., typing.Any]] = None,
+    ) -> None:
+        # A loop that is passed in belongs to the caller, who closes it
+        self._owns_loop = not loop
+        if virtual_clock:
+            loop_factory = VirtualClockEventLoop
+        if not loop:
+            loop = (loop_factory or asyncio.new_event_loop)()
+        self.app = app
+        self._loop = loop
+        self._client: Optional[SanicASGITestClient] = SanicASGITestClient(
+            app,
+            base_url=base_url,
+            suppress_exceptions=suppress_exceptions,
+            loop_monitor=loop_monitor,
+            json_loads=json_loads,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        if self._client:
+            self._run(self._client.aclose())
+            self._client = None
+        if self._owns_loop and not self._loop.is_closed():
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+    def _run(self, coro):
+        if not self._loop or self._loop.is_closed():
+            raise RuntimeError("Test client has no loop")
+        return self._loop.run_until_complete(coro)
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward (see virtual_clock)"""
+        if not isinstance(self._loop, VirtualClockEventLoop):
+            raise RuntimeError("The client does not use a virtual clock")
+        self._loop.advance(seconds)
+
+    def _sanic_endpoint_test(
+        self, method: str, *args, **kwargs
+    ) -> Tuple[Optional[Request], Optional[TestingResponse]]:
+        if not self._client:
+            raise RuntimeError("Test client has been closed")
+        return self._run(getattr(self._client, method)(*args, **kwargs))
+
+    def request(self, method, url, *args, **kwargs):
+        return self._sanic_endpoint_test(
+            "request", method, url, *args, **kwargs
+        )
+
+    def get(self, *args, **kwargs):
+        return self._sanic_endpoint_test("get", *args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._sanic_endpoint_test("post", *args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        return self._sanic_endpoint_test("put", *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._sanic_endpoint_test("delete", *args, **kwargs)
+
+    def patch(self, *args, **kwargs):
+        return self._sanic_endpoint_test("patch", *args, **kwargs)
+
+    def options(self, *args, **kwargs):
+        return self._sanic_endpoint_test("options", *args, **kwargs)
+
+    def head(self, *args, **kwargs):
+        return self._sanic_endpoint_test("head", *args, **kwargs)
+
+    def websocket(
+        self,
+        *args,
+        mimic: typing.Optional[
+            typing.Callable[..., typing.Coroutine[None, None, typing.Any]]
+        ] = None,
+        **kwargs,
+    ):
+        return self._sanic_endpoint_test(
+            "websocket", *args, mimic=mimic, **kwargs
+        )
@@ -1,7 +1,11 @@
+import asyncio
+import json
+import time
 import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import partial
 from ipaddress import IPv6Address, ip_address
-from json import JSONDecodeError
 from socket import AF_INET6, SOCK_STREAM, socket
 from string import ascii_lowercase
 
@@ -13,8 +17,18 @@ from sanic.log import logger  # type: ignore
 from sanic.request import Request  # type: ignore
 from sanic.response import text  # type: ignore
 
+from sanic_testing.assertions import BodyCheck, feed_all, verify_all
+from sanic_testing.deadline import (
+    DeadlineExceeded,
+    is_deadline,
+    run_with_deadline,
+)
+from sanic_testing.monitor import LoopMonitor
 from sanic_testing.websocket import websocket_proxy
 
+if typing.TYPE_CHECKING:
+    from sanic_testing.wire import ExchangeStats, WireStats
+
 ASGI_HOST = "mockserver"
 ASGI_PORT = 1234
 ASGI_BASE_URL = f"http://{ASGI_HOST}:{ASGI_PORT}"
@@ -26,12 +40,47 @@ httpx_version = tuple(
     map(int, httpx.__version__.strip(ascii_lowercase).split("."))
 )
 
+_WIRE_TRANSPORT_CONFLICT = (
+    "track_wire=True counts bytes with a transport of its own, and cannot "
+    "wrap a transport that is passed in. Wrap wire_transport(WireStats()) "
+    "in that transport instead, e.g. "
+    "ThrottledTransport(transport=wire_transport(stats))."
+)
+
+
+_UNDECODED = object()
+
+
+def _app_loads(app: Sanic) -> typing.Callable[..., typing.Any]:
+    """The JSON decoder the app uses for request bodies"""
+    return getattr(app.request_class, "_loads", None) or json.loads
+
 
 class TestingResponse(httpx.Response):
+    # Seconds from sending the request until the headers, the first body
+    # chunk and each body chunk arrived (or, on the ASGI client, were sent
+    # by the app). Only recorded by clients that stream the response.
+    headers_time: typing.Optional[float] = None
+    ttfb: typing.Optional[float] = None
+    chunk_times: typing.Sequence[float] = ()
+    # Bytes on the wire, when the client tracks them (track_wire=True)
+    wire: typing.Optional["ExchangeStats"] = None
+    # Decoder for .json, set by the clients to the app's own by default
+    json_loads = staticmethod(json.loads)
+    _json: typing.Any = _UNDECODED
+    # Only set when requested, with raw_cookies=True or body_checks=[...]
+    raw_cookies: typing.Dict[str, typing.Any]
+    body_checks: typing.List[BodyCheck]
+
     @property
     def status(self):
         return self.status_code
 
+    @property
+    def chunk_gaps(self) -> typing.List[float]:
+        times = list(self.chunk_times)
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
     @property
     def body(self):
         return self.content
@@ -42,29 +91,145 @@ class TestingResponse(httpx.Response):
 
     @property
     def json(self):
-        if getattr(self, "_json", None):
-            return self._json
-        try:
-            self._json = super().json()
-        except (JSONDecodeError, UnicodeDecodeError):
-            self._json = None
+        # Memoized, including falsy documents such as {} or 0
+        if self._json is _UNDECODED:
+            try:
+                self._json = self.json_loads(self.content)
+            except ValueError:
+                self._json = None
 
         return self._json
 
 
+def _remove_middleware(collection, func) -> None:
+    # Sanic wraps middleware in Middleware objects when the server starts
+    for middleware in list(collection):
+        if middleware is func or getattr(middleware, "func", None) is func:
+            collection.remove(middleware)
+
+
+def _as_testing_response(
+    response: httpx.Response, json_loads: typing.Callable[..., typing.Any]
+) -> TestingResponse:
+    """
+    Make an httpx response a TestingResponse in place, without copying
+    it, since the clients do not control how httpx builds responses
+    """
+    response.__class__ = TestingResponse
+    testing_response = typing.cast(TestingResponse, response)
+    if json_loads is not json.loads:
+        testing_response.json_loads = json_loads
+    return testing_response
+
+
 def _blank(*_, **__):
     ...
 
 
+def _set_timing(
+    response: httpx.Response,
+    headers_time: typing.Optional[float],
+    chunk_times: typing.List[float],
+) -> None:
+    response.headers_time = headers_time  # type: ignore
+    response.ttfb = chunk_times[0] if chunk_times else None  # type: ignore
+    response.chunk_times = chunk_times  # type: ignore
+
+
+class _TimedStream(httpx.AsyncByteStream):
+    """Records when each chunk of a response body arrives"""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        start: float,
+        chunk_times: typing.List[float],
+    ) -> None:
+        self._stream = stream
+        self._start = start
+        self._chunk_times = chunk_times
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            if chunk:
+                self._chunk_times.append(time.perf_counter() - self._start)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+async def _stream_request(
+    session: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *args,
+    body_checks: typing.Optional[typing.List[BodyCheck]] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request recording when the headers and each body chunk arrive
+
+    With body checks, the chunks are fed to them instead of being stored.
+    """
+    chunk_times: typing.List[float] = []
+    start = time.perf_counter()
+    async with session.stream(
+        method.upper(), url, *args, **kwargs
+    ) as response:
+        headers_time = time.perf_counter() - start
+        response.stream = _TimedStream(
+            typing.cast(httpx.AsyncByteStream, response.stream),
+            start,
+            chunk_times,
+        )
+        if body_checks:
+            async for chunk in response.aiter_bytes():
+                feed_all(body_checks, chunk)
+            response.body_checks = body_checks  # type: ignore
+        else:
+            await response.aread()
+    _set_timing(response, headers_time, chunk_times)
+    return response
+
+
+class _LoopFactoryPolicy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, loop_factory) -> None:
+        super().__init__()
+        self._loop_factory = loop_factory
+
+    def new_event_loop(self):
+        return self._loop_factory()
+
+
 class SanicTestClient:
     def __init__(
-        self, app: Sanic, port: typing.Optional[int] = PORT, host: str = HOST
+        self,
+        app: Sanic,
+        port: typing.Optional[int] = PORT,
+        host: str = HOST,
+        loop_monitor: typing.Optional[LoopMonitor] = None,
+        loop_factory: typing.Optional[
+            typing.Callable[[], asyncio.AbstractEventLoop]
+        ] = None,
+        track_wire: bool = False,
+        json_loads: typing.Optional[typing.Callable[..., typing.Any]] = None,
     ) -> None:
         """Use port=None to bind to a random port"""
         Sanic.test_mode = True
         self.app = app
         self.port = port
         self.host = host
+        self.loop_monitor = loop_monitor
+        self.loop_factory = loop_factory
+        self.wire_stats: typing.Optional["WireStats"] = None
+        if track_wire:
+            # sanic_testing.wire needs a newer httpcore than the rest of the
+            # package, so it is only imported when it is used
+            from sanic_testing import wire
+
+            self.wire_stats = wire.WireStats()
+        self.json_loads = json_loads or _app_loads(app)
         self._do_request = _blank
         app.after_server_start(self._run_request)
 
@@ -79,13 +244,37 @@ class SanicTestClient:
     def _end_test_mode(cls, sanic, *args, **kwargs):
         Sanic.test_mode = False
 
+    @contextmanager
+    def _loop_policy(self):
+        # app.run creates its loop from the current policy, after optionally
+        # switching the policy to uvloop itself
+        if not self.loop_factory:
+            yield
+            return
+        policy = asyncio.get_event_loop_policy()
+        use_uvloop = self.app.config.USE_UVLOOP
+        self.app.config.USE_UVLOOP = False
+        asyncio.set_event_loop_policy(_LoopFactoryPolicy(self.loop_factory))
+        try:
+            yield
+        finally:
+            asyncio.set_event_loop_policy(policy)
+            self.app.config.USE_UVLOOP = use_uvloop
+
     def get_new_session(self, **kwargs) -> httpx.AsyncClient:
+        if self.wire_stats is not None:
+            from sanic_testing import wire
+
+            if "transport" in kwargs:
+                raise ValueError(_WIRE_TRANSPORT_CONFLICT)
+            kwargs["transport"] = wire.wire_transport(self.wire_stats)
         return httpx.AsyncClient(verify=False, **kwargs)
 
     async def _local_request(self, method: str, url: str, *args, **kwargs):
         logger.info(url)
         raw_cookies = kwargs.pop("raw_cookies", None)
         session_kwargs = kwargs.pop("session_kwargs", {})
+        body_checks = kwargs.pop("body_checks", None)
         if httpx_version >= (0, 20) and method != "websocket":
             kwargs["follow_redirects"] = True
             allow_redirects = kwargs.pop("allow_redirects", None)
@@ -97,12 +286,24 @@ class SanicTestClient:
         else:
             async with self.get_new_session(**session_kwargs) as session:
                 try:
-                    if method == "request":
-                        args = tuple([url] + list(args))
-                        url = kwargs.pop("http_method", "GET").upper()
-                    response = await getattr(session, method.lower())(
-                        url, *args, **kwargs
-                    )
+                    if body_checks:
+                        if method == "request":
+                            method = kwargs.pop("http_method", "GET")
+                        response = await _stream_request(
+                            session,
+                            method,
+                            url,
+                            *args,
+                            body_checks=body_checks,
+                            **kwargs,
+                        )
+                    else:
+                        if method == "request":
+                            args = tuple([url] + list(args))
+                            url = kwargs.pop("http_method", "GET").upper()
+                        response = await getattr(session, method.lower())(
+                            url, *args, **kwargs
+                        )
                 except httpx.HTTPError as e:
                     if hasattr(e, "response"):
                         response = getattr(e, "response")
@@ -113,7 +314,10 @@ class SanicTestClient:
                         )
                         return None
 
-                response.__class__ = TestingResponse
+                response = _as_testing_response(response, self.json_loads)
+
+                if self.wire_stats is not None:
+                    response.wire = self.wire_stats.record(response)
 
                 if raw_cookies:
                     response.raw_cookies = {}
@@ -138,8 +342,23 @@ class SanicTestClient:
         loop,
         **request_kwargs,
     ):
+        timeout = request_kwargs.get("timeout")
+        if is_deadline(timeout):
+            # The deadline covers the whole request instead
+            request_kwargs["timeout"] = None
+        else:
+            timeout = None
         try:
-            response = await self._local_request(method, url, **request_kwargs)
+            request = run_with_deadline(
+                self._local_request(method, url, **request_kwargs),
+                timeout,
+                f"{method.upper()} {url}",
+            )
+            if self.loop_monitor:
+                async with self.loop_monitor.watch():
+                    response = await request
+            else:
+                response = await request
             results[-1] = response
             if method == "websocket":
                 await response.ws.close()
@@ -233,21 +452,29 @@ class SanicTestClient:
             **request_kwargs,
         )
 
-        self.app.run(  # type: ignore
-            debug=debug,
-            single_process=True,
-            **server_kwargs,
-        )
+        with self._loop_policy():
+            self.app.run(  # type: ignore
+                debug=debug,
+                single_process=True,
+                **server_kwargs,
+            )
+
+        if gather_request:
+            _remove_middleware(self.app.request_middleware, _collect_request)
+
+        for exception in exceptions:
+            if isinstance(exception, DeadlineExceeded):
+                raise exception
 
         if exceptions:
             raise ValueError(f"Exception during request: {exceptions}")
 
-        if gather_request:
-            try:
-                self.app.request_middleware.remove(_collect_request)  # type: ignore  # noqa
-            except BaseException:  # noqa
-                pass
+        if self.loop_monitor:
+            self.loop_monitor.check()
 
+        verify_all(getattr(results[-1], "body_checks", None))
+
+        if gather_request:
             try:
                 request, response = results
                 if response is None:
@@ -314,6 +541,53 @@ class SanicTestClient:
         return self._sanic_endpoint_test("websocket", *args, **kwargs)
 
 
+class _ASGITapState:
+    __slots__ = ("body_checks", "start", "headers_time", "chunk_times")
+
+    def __init__(
+        self, body_checks: typing.Optional[typing.List[BodyCheck]]
+    ) -> None:
+        self.body_checks = body_checks
+        self.start = time.perf_counter()
+        self.headers_time: typing.Optional[float] = None
+        self.chunk_times: typing.List[float] = []
+
+
+_asgi_tap: ContextVar[typing.Optional[_ASGITapState]] = ContextVar(
+    "asgi_tap", default=None
+)
+
+
+class _ASGIResponseTap:
+    """
+    Wraps the ASGI app to observe the response as the app sends it, before
+    httpx.ASGITransport buffers it: recording timings, and feeding the body
+    to body checks instead of letting it be buffered
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        state = _asgi_tap.get()
+        if state is None:
+            return await self.app(scope, receive, send)
+
+        async def tapped_send(message):
+            if message["type"] == "http.response.start":
+                state.headers_time = time.perf_counter() - state.start
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if body:
+                    state.chunk_times.append(time.perf_counter() - state.start)
+                if state.body_checks:
+                    feed_all(state.body_checks, body)
+                    message = {**message, "body": b""}
+            await send(message)
+
+        return await self.app(scope, receive, tapped_send)
+
+
 class TestASGIApp(ASGIApp):
     async def __call__(self):
         await super().__call__()
@@ -331,6 +605,8 @@ class SanicASGITestClient(httpx.AsyncClient):
         app: Sanic,
         base_url: str = ASGI_BASE_URL,
         suppress_exceptions: bool = False,
+        loop_monitor: typing.Optional[LoopMonitor] = None,
+        json_loads: typing.Optional[typing.Callable[..., typing.Any]] = None,
     ) -> None:
         Sanic.test_mode = True
 
@@ -339,12 +615,16 @@ class SanicASGITestClient(httpx.AsyncClient):
 
         self.sanic_app = app
 
-        transport = httpx.ASGITransport(app=app, client=(ASGI_HOST, ASGI_PORT))
+        transport = httpx.ASGITransport(
+            app=_ASGIResponseTap(app), client=(ASGI_HOST, ASGI_PORT)
+        )
 
         super().__init__(transport=transport, base_url=base_url)
 
         self.gather_request = True
         self.last_request = None
+        self.loop_monitor = loop_monitor
+        self.json_loads = json_loads or _app_loads(app)
 
     def _collect_request(self, request):
         if self.gather_request:
@@ -389,17 +669,67 @@ class SanicASGITestClient(httpx.AsyncClient):
             )
 
         self.gather_request = gather_request
-        response = await super().request(method, url, *args, **kwargs)
+        body_checks = kwargs.pop("body_checks", None)
+        timeout = kwargs.get("timeout")
+        if is_deadline(timeout):
+            kwargs.pop("timeout")
+        else:
+            timeout = None
+        state = _ASGITapState(body_checks)
+        token = _asgi_tap.set(state)
+        try:
+            request = run_with_deadline(
+                super().request(method, url, *args, **kwargs),
+                timeout,
+                f"{method} {url}",
+            )
+            if self.loop_monitor:
+                async with self.loop_monitor.watch():
+                    response = await request
+            else:
+                response = await request
+        finally:
+            _asgi_tap.reset(token)
+            await self.sanic_app._server_event("shutdown", "before")
+            await self.sanic_app._server_event("shutdown", "after")
+
+        if self.loop_monitor:
+            self.loop_monitor.check()
 
-        await self.sanic_app._server_event("shutdown", "before")
-        await self.sanic_app._server_event("shutdown", "after")
+        response = _as_testing_response(response, self.json_loads)
+        _set_timing(response, state.headers_time, state.chunk_times)
 
-        response.__class__ = TestingResponse
+        if body_checks:
+            response.body_checks = body_checks
+            verify_all(body_checks)
 
         if gather_request:
             return self.last_request, response  # type: ignore
         return None, response  # type: ignore
 
+    # httpx only accepts its own keyword arguments on the verb methods, so
+    # route them through request() to support the test client extras
+    async def get(self, url, **kwargs):  # type: ignore
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):  # type: ignore
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs):  # type: ignore
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url, **kwargs):  # type: ignore
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url, **kwargs):  # type: ignore
+        return await self.request("DELETE", url, **kwargs)
+
+    async def options(self, url, **kwargs):  # type: ignore
+        return await self.request("OPTIONS", url, **kwargs)
+
+    async def head(self, url, **kwargs):  # type: ignore
+        return await self.request("HEAD", url, **kwargs)
+
     @classmethod
     async def _ws_receive(cls):
         return {}
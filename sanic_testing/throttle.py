@@ -0,0 +1,175 @@
+import asyncio
+import socket
+import typing
+from typing import Optional
+
+import httpx
+from sanic import Sanic
+from sanic.request import Request
+
+
+class ThrottleStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.writes = 0
+        self.reads = 0
+        self.server_writes = 0
+        self.server_buffered_max = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<ThrottleStats requests={self.requests} "
+            f"sent={self.bytes_sent} received={self.bytes_received} "
+            f"server_buffered_max={self.server_buffered_max}>"
+        )
+
+
+async def _pace(size: int, rate: Optional[float]) -> None:
+    if rate:
+        await asyncio.sleep(size / rate)
+
+
+def _split(data: bytes, size: Optional[int]) -> typing.Iterator[bytes]:
+    if not size or len(data) <= size:
+        yield data
+        return
+    view = memoryview(data)
+    for start in range(0, len(data), size):
+        end = start + size
+        yield bytes(view[start:end])
+
+
+class _ThrottledUpload(httpx.AsyncByteStream):
+    def __init__(self, stream, throttle: "ThrottledTransport") -> None:
+        self._stream = stream
+        self._throttle = throttle
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        throttle = self._throttle
+        async for chunk in self._stream:
+            for part in _split(chunk, throttle.write_size):
+                await _pace(len(part), throttle.upload_rate)
+                throttle.stats.writes += 1
+                throttle.stats.bytes_sent += len(part)
+                yield part
+
+
+class _ThrottledDownload(httpx.AsyncByteStream):
+    def __init__(self, stream, throttle: "ThrottledTransport") -> None:
+        self._stream = stream
+        self._throttle = throttle
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        throttle = self._throttle
+        if throttle.read_delay:
+            await asyncio.sleep(throttle.read_delay)
+        async for chunk in self._stream:
+            for part in _split(chunk, throttle.read_size):
+                await _pace(len(part), throttle.download_rate)
+                throttle.stats.reads += 1
+                throttle.stats.bytes_received += len(part)
+                yield part
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class ThrottledTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that simulates a slow client over a real connection
+
+    Rates are in bytes per second. Request bodies are split into
+    ``write_size`` writes and response bodies are consumed in
+    ``read_size`` reads, with a ``read_delay`` before the body is read
+    at all. ``receive_buffer`` shrinks the client socket's SO_RCVBUF so
+    that a slow reader pushes back on the server sooner.
+
+    Call ``watch(app)`` before the server starts to also record how much
+    data the Sanic server held in its write buffer.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        *,
+        upload_rate: Optional[float] = None,
+        download_rate: Optional[float] = None,
+        read_delay: float = 0.0,
+        write_size: Optional[int] = None,
+        read_size: Optional[int] = None,
+        receive_buffer: Optional[int] = None,
+        **transport_kwargs,
+    ) -> None:
+        self.upload_rate = upload_rate
+        self.download_rate = download_rate
+        self.read_delay = read_delay
+        self.write_size = write_size
+        self.read_size = read_size
+        self.stats = ThrottleStats()
+
+        if receive_buffer:
+            transport_kwargs.setdefault("socket_options", []).append(
+                (socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+            )
+        transport_kwargs.setdefault("verify", False)
+        self._transport_kwargs = transport_kwargs
+        self._owns_transport = transport is None
+        self._transport = transport
+
+    def watch(self, app: Sanic) -> None:
+        app.signal("http.lifecycle.send")(self._on_server_send)
+
+    async def _on_server_send(self, data, **_):
+        try:
+            request = Request.get_current()
+        except Exception:  # noqa
+            return
+        transport = request.transport
+        if transport is None or not hasattr(
+            transport, "get_write_buffer_size"
+        ):
+            return
+        self.stats.server_writes += 1
+        # The signal fires just before the server writes, so sample the
+        # buffer on the next loop iteration once the write has happened
+        asyncio.get_running_loop().call_soon(self._sample_buffer, transport)
+
+    def _sample_buffer(self, transport) -> None:
+        if transport.is_closing():
+            return
+        buffered = transport.get_write_buffer_size()
+        if buffered > self.stats.server_buffered_max:
+            self.stats.server_buffered_max = buffered
+
+    def _get_transport(self) -> httpx.AsyncBaseTransport:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(
+                **self._transport_kwargs
+            )
+        return self._transport
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        self.stats.requests += 1
+        if self.upload_rate or self.write_size:
+            request.stream = _ThrottledUpload(request.stream, self)
+        response = await self._get_transport().handle_async_request(request)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ThrottledDownload(response.stream, self),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        # A transport we created ourselves is rebuilt on next use so that
+        # the throttle can outlive sessions (e.g. SanicTestClient, which
+        # opens a new session per request).
+        if self._transport is not None:
+            await self._transport.aclose()
+            if self._owns_transport:
+                self._transport = None
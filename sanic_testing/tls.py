@@ -0,0 +1,50 @@
+import ssl
+from typing import Optional, Sequence
+
+
+def _trustme():
+    try:
+        import trustme  # type: ignore
+    except ImportError:
+        raise RuntimeError(
+            "TLS mode requires trustme. Install it with: "
+            "pip install sanic-testing[tls]"
+        ) from None
+    return trustme
+
+
+class LocalTLS:
+    """
+    A throwaway certificate authority and a server certificate issued by
+    it, for serving an app over TLS in tests without touching the system
+    trust store
+
+    The server context can be passed to Sanic as ``ssl=``, and the client
+    context to httpx as ``verify=``.
+    """
+
+    def __init__(self, hosts: Sequence[str] = ("127.0.0.1", "localhost")):
+        trustme = _trustme()
+        self.hosts = tuple(hosts)
+        self.ca = trustme.CA()
+        self.certificate = self.ca.issue_cert(*self.hosts)
+        self._server_context: Optional[ssl.SSLContext] = None
+        self._client_context: Optional[ssl.SSLContext] = None
+
+    @property
+    def server_context(self) -> ssl.SSLContext:
+        if self._server_context is None:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            self.certificate.configure_cert(context)
+            self._server_context = context
+        return self._server_context
+
+    @property
+    def client_context(self) -> ssl.SSLContext:
+        # Reused, since TLS sessions can only be resumed by the context
+        # that created them
+        if self._client_context is None:
+            context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+            self.ca.configure_trust(context)
+            self._client_context = context
+        return self._client_context
@@ -0,0 +1,292 @@
+import asyncio
+import json as _json
+import random
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+from sanic import Sanic
+
+from sanic_testing.testing import HOST
+
+Latency = Union[float, Tuple[float, float], Callable[[random.Random], float]]
+
+_Result = Optional[Tuple[int, Dict[str, str], bytes]]
+
+
+class UpstreamRoute:
+    def __init__(
+        self,
+        methods: Iterable[str],
+        path: str,
+        status: int = 200,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        drop_rate: float = 0.0,
+    ) -> None:
+        self.methods = {method.upper() for method in methods}
+        self.path = path
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.calls = 0
+        self.errors = 0
+        self.drops = 0
+
+    def __repr__(self) -> str:
+        return f"<UpstreamRoute {sorted(self.methods)} {self.path}>"
+
+    def delay(self, rng: random.Random) -> float:
+        if callable(self.latency):
+            return self.latency(rng)
+        if isinstance(self.latency, tuple):
+            return rng.uniform(*self.latency)
+        return self.latency
+
+
+def exponential(mean: float) -> Callable[[random.Random], float]:
+    """Exponentially distributed latency, for a long tail of slow calls"""
+    return lambda rng: rng.expovariate(1 / mean)
+
+
+class MockUpstream:
+    """
+    A stand-in for a service that the app calls over HTTP
+
+    Each route answers with a canned response after a configurable delay,
+    and can fail with an error status or by dropping the connection at a
+    given rate. Random choices use ``seed`` so that runs are repeatable.
+
+    The upstream can be used in two ways:
+
+    - In process: mount ``transport()`` on the app's httpx.AsyncClient,
+      e.g. ``mounts={"http://payments.internal": upstream.transport()}``,
+      to answer requests for that host without touching the network.
+    - As a live server: ``attach(app)`` starts it on the app's event loop
+      when the server starts (for SanicTestClient and ReusableClient), and
+      the app is pointed at ``upstream.url``. Requests then go through the
+      app's own connection pool, so pool limits and timeouts apply.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        host: str = HOST,
+        port: int = 0,
+    ) -> None:
+        self.routes: List[UpstreamRoute] = []
+        self.requests: List[Tuple[str, str]] = []
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def route(
+        self,
+        path: str,
+        methods: Iterable[str] = ("GET",),
+        status: int = 200,
+        body: bytes = b"",
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        drop_rate: float = 0.0,
+    ) -> UpstreamRoute:
+        """
+        Add a route. ``latency`` is a number of seconds, a (low, high)
+        range to draw from uniformly, or a callable that takes a
+        random.Random and returns seconds.
+        """
+        headers = dict(headers or {})
+        if json is not None:
+            body = _json.dumps(json).encode()
+            headers.setdefault("content-type", "application/json")
+        route = UpstreamRoute(
+            methods,
+            path,
+            status,
+            body,
+            headers,
+            latency,
+            error_rate,
+            error_status,
+            drop_rate,
+        )
+        self.routes.append(route)
+        return route
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.connections = 0
+        self.peak_in_flight = 0
+        for route in self.routes:
+            route.calls = route.errors = route.drops = 0
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("MockUpstream has not been started")
+        return f"http://{self.host}:{self.port}"
+
+    def _match(self, method: str, path: str) -> Optional[UpstreamRoute]:
+        for route in self.routes:
+            if route.path == path and method in route.methods:
+                return route
+        return None
+
+    async def _respond(self, method: str, path: str) -> _Result:
+        """The response to send, or None to drop the connection"""
+        self.requests.append((method, path))
+        route = self._match(method, path)
+        if route is None:
+            return 404, {}, b""
+        route.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = route.delay(self._random)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        roll = self._random.random()
+        if roll < route.drop_rate:
+            route.drops += 1
+            return None
+        if roll < route.drop_rate + route.error_rate:
+            route.errors += 1
+            return route.error_status, {}, b""
+        return route.status, route.headers, route.body
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """An httpx transport answering every request from the upstream"""
+        return _UpstreamTransport(self)
+
+    def attach(self, app: Sanic) -> None:
+        """Run the upstream alongside the app's server, on the same loop"""
+        app.before_server_start(self._before_server_start)
+        app.after_server_stop(self._after_server_stop)
+
+    async def _before_server_start(self, *_) -> None:
+        await self.start()
+
+    async def _after_server_stop(self, *_) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port
+        )
+        # Keep the same port across restarts so that url stays valid
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockUpstream":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Just enough HTTP/1.1 for keep-alive clients sending bodies with
+        # a content-length
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, _ = line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                result = await self._respond(method, target.split("?")[0])
+                if result is None:
+                    writer.transport.abort()
+                    return
+                status, response_headers, body = result
+                head = [
+                    f"HTTP/1.1 {status} {_reason(status)}",
+                    f"content-length: {len(body)}",
+                ]
+                head.extend(f"{k}: {v}" for k, v in response_headers.items())
+                writer.write(
+                    ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        # Statuses such as 599 have no standard phrase, which may be empty
+        return ""
+
+
+class _UpstreamTransport(httpx.AsyncBaseTransport):
+    def __init__(self, upstream: MockUpstream) -> None:
+        self.upstream = upstream
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        await request.aread()
+        # Apply the client's read timeout as a network transport would
+        timeout = request.extensions.get("timeout", {}).get("read")
+        try:
+            result = await asyncio.wait_for(
+                self.upstream._respond(request.method, request.url.path),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            raise httpx.ReadTimeout("Timed out", request=request) from None
+        if result is None:
+            raise httpx.RemoteProtocolError(
+                "Server disconnected without sending a response.",
+                request=request,
+            )
+        status, headers, body = result
+        return httpx.Response(
+            status, headers=headers, content=body, request=request
+        )
@@ -0,0 +1,489 @@
+import itertools
+import ssl
+import time
+import typing
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import httpcore
+import httpx
+
+if not hasattr(httpcore, "AsyncNetworkBackend"):
+    raise ImportError(
+        "Wire tracking requires the network backends of httpcore 0.18 or "
+        "later. Upgrade with: pip install 'httpx>=0.25'"
+    )
+
+
+class ConnectionStats:
+    def __init__(self, connection_id: int, host: str, port: int) -> None:
+        self.id = connection_id
+        self.host = host
+        self.port = port
+        self.closed = False
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.tls: Optional[TLSHandshake] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConnectionStats id={self.id} requests={self.requests} "
+            f"sent={self.bytes_sent} received={self.bytes_received} "
+            f"closed={self.closed}>"
+        )
+
+
+class TLSHandshake:
+    def __init__(
+        self,
+        duration: float,
+        resumed: bool,
+        version: Optional[str],
+        cipher: Optional[str],
+    ) -> None:
+        self.duration = duration
+        self.resumed = resumed
+        self.version = version
+        self.cipher = cipher
+
+    def __repr__(self) -> str:
+        return (
+            f"<TLSHandshake {self.version} duration={self.duration:.6f} "
+            f"resumed={self.resumed}>"
+        )
+
+
+class ExchangeStats:
+    """Bytes on the wire for a single request/response exchange"""
+
+    def __init__(
+        self,
+        connection: ConnectionStats,
+        bytes_sent: int,
+        bytes_received: int,
+        body_bytes: int,
+        content_bytes: Optional[int],
+    ) -> None:
+        self.connection = connection
+        self.request_number = connection.requests
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.body_bytes = body_bytes
+        self.content_bytes = content_bytes
+
+    @property
+    def reused(self) -> bool:
+        return self.request_number > 1
+
+    @property
+    def overhead_bytes(self) -> int:
+        """Response bytes that were not body: headers and chunk framing"""
+        return self.bytes_received - self.body_bytes
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.content_bytes:
+            return None
+        return self.body_bytes / self.content_bytes
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExchangeStats connection={self.connection.id} "
+            f"request={self.request_number} sent={self.bytes_sent} "
+            f"received={self.bytes_received}>"
+        )
+
+
+class WireStats:
+    """
+    Connection and byte counters aggregated over every request a client
+    sends through a transport created by wire_transport()
+    """
+
+    def __init__(self) -> None:
+        self.connections: List[ConnectionStats] = []
+        self.exchanges: List[ExchangeStats] = []
+        self._ids = itertools.count(1)
+        # TLS sessions to resume, by server name
+        self._tls_sessions: Dict[Optional[str], ssl.SSLSession] = {}
+
+    def reset(self) -> None:
+        self.connections.clear()
+        self.exchanges.clear()
+
+    @property
+    def connections_opened(self) -> int:
+        return len(self.connections)
+
+    @property
+    def connections_closed(self) -> int:
+        return sum(1 for connection in self.connections if connection.closed)
+
+    @property
+    def requests(self) -> int:
+        return len(self.exchanges)
+
+    @property
+    def reused_requests(self) -> int:
+        return sum(1 for exchange in self.exchanges if exchange.reused)
+
+    @property
+    def requests_per_connection(self) -> float:
+        if not self.connections:
+            return 0.0
+        return self.requests / len(self.connections)
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(connection.bytes_sent for connection in self.connections)
+
+    @property
+    def bytes_received(self) -> int:
+        return sum(
+            connection.bytes_received for connection in self.connections
+        )
+
+    @property
+    def handshakes(self) -> List[TLSHandshake]:
+        return [c.tls for c in self.connections if c.tls is not None]
+
+    @property
+    def handshake_times(self) -> List[float]:
+        return [handshake.duration for handshake in self.handshakes]
+
+    @property
+    def resumption_rate(self) -> float:
+        """Share of TLS handshakes that resumed an earlier session"""
+        handshakes = self.handshakes
+        if not handshakes:
+            return 0.0
+        resumed = sum(1 for handshake in handshakes if handshake.resumed)
+        return resumed / len(handshakes)
+
+    def __repr__(self) -> str:
+        return (
+            f"<WireStats connections={self.connections_opened} "
+            f"requests={self.requests} sent={self.bytes_sent} "
+            f"received={self.bytes_received}>"
+        )
+
+    def record(self, response: httpx.Response) -> Optional[ExchangeStats]:
+        """Attribute the bytes since the previous exchange to this one"""
+        stream = response.extensions.get("network_stream")
+        if not isinstance(stream, _CountingStream):
+            return None
+        sent, received = stream.take()
+        connection = stream.stats
+        connection.requests += 1
+        try:
+            content_bytes: Optional[int] = len(response.content)
+        except httpx.ResponseNotRead:
+            content_bytes = None
+        exchange = ExchangeStats(
+            connection,
+            sent,
+            received,
+            response.num_bytes_downloaded,
+            content_bytes,
+        )
+        self.exchanges.append(exchange)
+        return exchange
+
+
+class _CountingStream(httpcore.AsyncNetworkStream):
+    def __init__(
+        self,
+        stream: httpcore.AsyncNetworkStream,
+        stats: ConnectionStats,
+        sessions: Optional[Dict[Optional[str], ssl.SSLSession]] = None,
+    ) -> None:
+        self._stream = stream
+        self.stats = stats
+        self._sent = 0
+        self._received = 0
+        self._sessions = sessions
+        self._server_hostname: Optional[str] = None
+        self._ssl_object: Optional[ssl.SSLObject] = None
+
+    def take(self) -> typing.Tuple[int, int]:
+        sent, received = self._sent, self._received
+        self._sent = self._received = 0
+        return sent, received
+
+    async def read(
+        self, max_bytes: int, timeout: Optional[float] = None
+    ) -> bytes:
+        data = await self._stream.read(max_bytes, timeout=timeout)
+        self._received += len(data)
+        self.stats.bytes_received += len(data)
+        if self._ssl_object is not None and self._sessions is not None:
+            # TLS 1.3 session tickets arrive after the handshake
+            session = self._ssl_object.session
+            if session is not None:
+                self._sessions[self._server_hostname] = session
+        return data
+
+    async def write(
+        self, buffer: bytes, timeout: Optional[float] = None
+    ) -> None:
+        await self._stream.write(buffer, timeout=timeout)
+        self._sent += len(buffer)
+        self.stats.bytes_sent += len(buffer)
+
+    async def aclose(self) -> None:
+        self.stats.closed = True
+        await self._stream.aclose()
+
+    async def start_tls(self, ssl_context, server_hostname=None, timeout=None):
+        start = time.perf_counter()
+        if self._sessions is None:
+            self._stream = await self._stream.start_tls(
+                ssl_context, server_hostname=server_hostname, timeout=timeout
+            )
+        else:
+            self._server_hostname = server_hostname
+            stream = _TLSStream(
+                self._stream,
+                ssl_context,
+                server_hostname,
+                self._sessions.get(server_hostname),
+            )
+            await stream.handshake(timeout)
+            self._stream = stream
+            self._ssl_object = stream._ssl
+        ssl_object = self.get_extra_info("ssl_object")
+        cipher = ssl_object.cipher() if ssl_object else None
+        self.stats.tls = TLSHandshake(
+            time.perf_counter() - start,
+            bool(ssl_object and ssl_object.session_reused),
+            ssl_object.version() if ssl_object else None,
+            cipher[0] if cipher else None,
+        )
+        return self
+
+    def get_extra_info(self, info: str) -> typing.Any:
+        return self._stream.get_extra_info(info)
+
+
+class _TLSStream(httpcore.AsyncNetworkStream):
+    """
+    TLS over a memory BIO, so that a previous session can be offered for
+    resumption, which the httpcore backends do not support
+    """
+
+    def __init__(
+        self,
+        stream: httpcore.AsyncNetworkStream,
+        ssl_context: ssl.SSLContext,
+        server_hostname: Optional[str],
+        session: Optional[ssl.SSLSession],
+    ) -> None:
+        self._stream = stream
+        self._incoming = ssl.MemoryBIO()
+        self._outgoing = ssl.MemoryBIO()
+        self._ssl = ssl_context.wrap_bio(
+            self._incoming,
+            self._outgoing,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    async def _call(self, operation, *args, timeout=None):
+        while True:
+            try:
+                result = operation(*args)
+            except ssl.SSLWantReadError:
+                await self._flush(timeout)
+                data = await self._stream.read(65536, timeout=timeout)
+                if data:
+                    self._incoming.write(data)
+                else:
+                    self._incoming.write_eof()
+            else:
+                await self._flush(timeout)
+                return result
+
+    async def _flush(self, timeout) -> None:
+        data = self._outgoing.read()
+        if data:
+            await self._stream.write(data, timeout=timeout)
+
+    async def handshake(self, timeout: Optional[float]) -> None:
+        try:
+            await self._call(self._ssl.do_handshake, timeout=timeout)
+        except ssl.SSLError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+    async def read(
+        self, max_bytes: int, timeout: Optional[float] = None
+    ) -> bytes:
+        try:
+            return await self._call(self._ssl.read, max_bytes, timeout=timeout)
+        except (ssl.SSLZeroReturnError, ssl.SSLEOFError):
+            return b""
+        except ssl.SSLError as e:
+            raise httpcore.ReadError(str(e)) from e
+
+    async def write(
+        self, buffer: bytes, timeout: Optional[float] = None
+    ) -> None:
+        view = memoryview(buffer)
+        try:
+            while view:
+                written = await self._call(
+                    self._ssl.write, view, timeout=timeout
+                )
+                view = view[written:]
+        except ssl.SSLError as e:
+            raise httpcore.WriteError(str(e)) from e
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+    def get_extra_info(self, info: str) -> typing.Any:
+        if info == "ssl_object":
+            return self._ssl
+        if info == "is_readable":
+            return self._incoming.pending or self._stream.get_extra_info(info)
+        return self._stream.get_extra_info(info)
+
+
+class _CountingBackend(httpcore.AsyncNetworkBackend):
+    def __init__(
+        self,
+        stats: WireStats,
+        backend: httpcore.AsyncNetworkBackend,
+        resume_tls_sessions: bool = False,
+    ) -> None:
+        self._stats = stats
+        self._backend = backend
+        self._sessions = stats._tls_sessions if resume_tls_sessions else None
+
+    async def connect_tcp(self, host, port, *args, **kwargs):
+        stream = await self._backend.connect_tcp(host, port, *args, **kwargs)
+        connection = ConnectionStats(next(self._stats._ids), host, port)
+        self._stats.connections.append(connection)
+        return _CountingStream(stream, connection, self._sessions)
+
+    async def connect_unix_socket(self, path, *args, **kwargs):
+        stream = await self._backend.connect_unix_socket(path, *args, **kwargs)
+        connection = ConnectionStats(next(self._stats._ids), path, 0)
+        self._stats.connections.append(connection)
+        return _CountingStream(stream, connection, self._sessions)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore exceptions and their httpx counterparts, most specific first
+_EXCEPTIONS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _httpx_errors() -> typing.Iterator[None]:
+    try:
+        yield
+    except Exception as e:
+        for source, target in _EXCEPTIONS:
+            if isinstance(e, source):
+                raise target(str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: typing.AsyncIterable[bytes]) -> None:
+        self._stream = stream
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class _WireTransport(httpx.AsyncBaseTransport):
+    """Sends requests through a connection pool with a counting backend"""
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool) -> None:
+        self._pool = pool
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=typing.cast(typing.AsyncIterable[bytes], request.stream),
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            response = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(
+                typing.cast(typing.AsyncIterable[bytes], response.stream)
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def wire_transport(
+    stats: WireStats,
+    resume_tls_sessions: bool = False,
+    verify: typing.Union[ssl.SSLContext, str, bool] = False,
+    limits: Optional[httpx.Limits] = None,
+    **pool_kwargs,
+) -> httpx.AsyncBaseTransport:
+    """
+    An httpx transport whose connections report to the given WireStats
+
+    With resume_tls_sessions, new TLS connections offer the session of
+    the previous connection to the same server, as browsers do. ``verify``
+    and ``limits`` are as for httpx.AsyncHTTPTransport. Other keyword
+    arguments, such as ``http2`` or ``retries``, are passed to
+    httpcore.AsyncConnectionPool.
+    """
+    limits = limits or httpx.Limits(
+        max_connections=100, max_keepalive_connections=20
+    )
+    pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(verify=verify),
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=_CountingBackend(
+            stats, httpcore.AnyIOBackend(), resume_tls_sessions
+        ),
+        **pool_kwargs,
+    )
+    return _WireTransport(pool)
@@ -51,13 +51,14 @@ setup_kwargs = {
 requirements = ["httpx>=0.18"]
 
 tests_require = [
-    "pytest", "sanic>=22.12", "pytest-asyncio",
+    "pytest", "sanic>=22.12", "pytest-asyncio", "trustme",
     "setuptools;python_version>'3.11'"
 ]
 
 setup_kwargs["install_requires"] = requirements
 setup_kwargs["tests_require"] = tests_require
 setup_kwargs["extras_require"] = {
-    'dev': tests_require
+    'dev': tests_require,
+    'tls': ["trustme"],
 }
 setup(**setup_kwargs)
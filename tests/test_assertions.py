@@ -0,0 +1,163 @@
+import hashlib
+import json
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing import TestManager
+from sanic_testing.assertions import (
+    BodyCheck,
+    Digest,
+    JSONPath,
+    Length,
+    Prefix,
+    parse_json_path,
+)
+from sanic_testing.reusable import ReusableClient
+
+DOCUMENT = {
+    "meta": {"count": 3, "name": 'ex"port', "tags": []},
+    "items": [
+        {"id": 1, "value": 1.5},
+        {"id": 2, "value": None, "nested": {"deep": [True, False]}},
+        {"id": 3, "value": "three"},
+    ],
+    "empty": {},
+    "total": 42,
+}
+BODY = json.dumps(DOCUMENT).encode()
+STREAMED = [b"chunk-%d;" % i for i in range(1000)]
+
+
+@pytest.fixture
+def body_app():
+    sanic_app = Sanic("body_app")
+    TestManager(sanic_app)
+
+    @sanic_app.get("/stream")
+    async def stream(request):
+        resp = await request.respond()
+        for chunk in STREAMED:
+            await resp.send(chunk)
+        await resp.eof()
+
+    @sanic_app.get("/json")
+    async def document(request):
+        return response.raw(BODY, content_type="application/json")
+
+    return sanic_app
+
+
+def _feed(check, data, size):
+    for start in range(0, len(data), size):
+        end = start + size
+        check.feed(data[start:end])
+    check.finish()
+    return check
+
+
+def test_parse_json_path():
+    assert parse_json_path("$") == []
+    assert parse_json_path("$.items[1].id") == ["items", 1, "id"]
+    assert parse_json_path("meta['count']") == ["meta", "count"]
+    with pytest.raises(ValueError):
+        parse_json_path("$..items")
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("$.meta.count", 3),
+        ("$.meta.name", 'ex"port'),
+        ("$.meta.tags", []),
+        ("$.items[0].value", 1.5),
+        ("$.items[1].value", None),
+        ("$.items[1].nested", {"deep": [True, False]}),
+        ("$.items[1].nested.deep[1]", False),
+        ("$.items[2]", {"id": 3, "value": "three"}),
+        ("$.empty", {}),
+        ("$.total", 42),
+        ("$", DOCUMENT),
+    ],
+)
+def test_json_path(path, expected, size):
+    check = _feed(JSONPath(path, expected), BODY, size)
+
+    assert check.found
+    assert check.value == expected
+    check.verify()
+
+
+def test_json_path_missing():
+    check = _feed(JSONPath("$.items[5]"), BODY, 64)
+
+    assert not check.found
+    with pytest.raises(AssertionError):
+        check.verify()
+
+
+def test_json_path_wrong_value():
+    check = _feed(JSONPath("$.total", 41), BODY, 64)
+
+    with pytest.raises(AssertionError):
+        check.verify()
+
+
+def test_body_checks_test_client(body_app):
+    full = b"".join(STREAMED)
+    digest = Digest("sha256", hashlib.sha256(full).hexdigest())
+    length = Length(len(full))
+    prefix = Prefix(b"chunk-0;chunk-1;")
+
+    _, response = body_app.test_client.get(
+        "/stream", body_checks=[digest, length, prefix]
+    )
+
+    assert response.status == 200
+    assert response.body_checks == [digest, length, prefix]
+    assert length.length == len(full)
+
+
+def test_failed_body_check_removes_request_collector(body_app):
+    for _ in range(3):
+        with pytest.raises(AssertionError):
+            body_app.test_client.get("/json", body_checks=[Length(1)])
+
+    assert len(body_app.request_middleware) == 0
+
+
+def test_body_check_requires_feed():
+    class Incomplete(BodyCheck):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_body_checks_reusable_client(body_app):
+    with ReusableClient(body_app) as client:
+        _, response = client.get(
+            "/json", body_checks=[JSONPath("$.items[2].id", 3)]
+        )
+        with pytest.raises(AssertionError):
+            client.get("/json", body_checks=[Length(1)])
+
+
+@pytest.mark.asyncio
+async def test_body_checks_asgi_client(body_app):
+    length = Length()
+    _, response = await body_app.asgi_client.get(
+        "/stream",
+        body_checks=[length, Prefix(b"chunk-0;"), Digest("md5")],
+    )
+
+    assert response.status == 200
+    assert length.length == len(b"".join(STREAMED))
+    # The body is not kept in memory
+    assert response.body == b""
+
+    with pytest.raises(AssertionError):
+        await body_app.asgi_client.get(
+            "/json", body_checks=[JSONPath("$.total", 0)]
+        )
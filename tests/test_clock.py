@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.clock import (
+    VirtualClockEventLoop,
+    VirtualClockEventLoopPolicy,
+)
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.sync import SyncASGITestClient
+from sanic_testing.testing import SanicASGITestClient
+
+
+@pytest.fixture
+def ttl_app():
+    sanic_app = Sanic("ttl_app")
+    sanic_app.ctx.cache = {}
+
+    @sanic_app.get("/slow")
+    async def slow(request):
+        await asyncio.sleep(3600)
+        return response.text("done")
+
+    @sanic_app.get("/timeout")
+    async def timeout(request):
+        try:
+            await asyncio.wait_for(asyncio.sleep(10), 5)
+        except asyncio.TimeoutError:
+            return response.text("timed out")
+        return response.text("finished")
+
+    @sanic_app.get("/cached")
+    async def cached(request):
+        loop = asyncio.get_running_loop()
+        value, expires = request.app.ctx.cache.get("key", (None, 0))
+        if expires <= loop.time():
+            value = len(request.app.ctx.cache) + loop.time()
+            request.app.ctx.cache["key"] = (value, loop.time() + 60)
+        return response.json(value)
+
+    return sanic_app
+
+
+def test_reusable_client_virtual_clock(ttl_app):
+    start = time.monotonic()
+    with ReusableClient(ttl_app, virtual_clock=True) as client:
+        _, response = client.get("/slow")
+        assert response.text == "done"
+        _, response = client.get("/timeout")
+        assert response.text == "timed out"
+
+        _, first = client.get("/cached")
+        client.advance(30)
+        _, second = client.get("/cached")
+        client.advance(31)
+        _, third = client.get("/cached")
+        assert round(client._loop.elapsed, 6) >= 3600 + 5 + 61
+
+    assert first.json == second.json
+    assert third.json != first.json
+    assert time.monotonic() - start < 5
+
+
+def test_sync_asgi_client_virtual_clock(ttl_app):
+    with SyncASGITestClient(ttl_app, virtual_clock=True) as client:
+        _, response = client.get("/slow")
+        _, first = client.get("/cached")
+        client.advance(61)
+        _, second = client.get("/cached")
+
+    assert response.text == "done"
+    assert first.json != second.json
+
+
+def test_advance_requires_virtual_clock(ttl_app):
+    with SyncASGITestClient(ttl_app) as client:
+        with pytest.raises(RuntimeError):
+            client.advance(1)
+
+
+def test_timers_fire_in_order():
+    loop = VirtualClockEventLoop(start=0)
+    fired = []
+    for delay in (3, 1, 2):
+        loop.call_later(delay, lambda d=delay: fired.append((d, loop.time())))
+    loop.advance(5)
+
+    assert fired == [(1, 1), (2, 2), (3, 3)]
+    assert loop.time() == 5
+    with pytest.raises(ValueError):
+        loop.advance(-1)
+    loop.close()
+
+
+def test_executor_jobs_use_real_time():
+    loop = VirtualClockEventLoop(start=0)
+
+    async def work():
+        timer = loop.call_later(10, lambda: None)
+        result = await loop.run_in_executor(None, time.sleep, 0.05)
+        timer.cancel()
+        return result
+
+    loop.run_until_complete(asyncio.wait_for(work(), 1))
+    assert loop.time() < 1
+    loop.close()
+
+
+def test_patch_time():
+    loop = VirtualClockEventLoop()
+    with loop.patch_time():
+        before = time.monotonic(), time.time()
+        loop.advance(100)
+        after = time.monotonic(), time.time()
+    loop.close()
+
+    assert after[0] - before[0] == pytest.approx(100)
+    assert round(after[1] - before[1]) == 100
+
+
+def test_asgi_client_with_policy(ttl_app):
+    async def scenario():
+        client = SanicASGITestClient(ttl_app)
+        _, first = await client.get("/cached")
+        await asyncio.sleep(61)
+        _, second = await client.get("/cached")
+        return first, second
+
+    loop = VirtualClockEventLoopPolicy().new_event_loop()
+    first, second = loop.run_until_complete(scenario())
+    loop.close()
+
+    assert first.json != second.json
+    assert loop.elapsed >= 61
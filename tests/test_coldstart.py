@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from sanic_testing.coldstart import (
+    PHASES,
+    ColdStartBenchmark,
+    format_report,
+    main,
+)
+
+APP_MODULE = """
+from sanic import Sanic, response
+
+app = Sanic("coldstart_app")
+
+
+@app.get("/health")
+async def health(request):
+    return response.text("ok")
+
+
+def create_app():
+    return app
+"""
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    (tmp_path / "coldstart_app.py").write_text(APP_MODULE)
+    return tmp_path
+
+
+@pytest.mark.parametrize("server", ["run", "create_server"])
+def test_cold_start(app_dir, server):
+    result = ColdStartBenchmark(
+        "coldstart_app:app",
+        runs=2,
+        path="/health",
+        server=server,
+        cwd=str(app_dir),
+    ).run()
+
+    assert not result.errors
+    for name in PHASES:
+        assert result.phase(name).count == 2
+    process = result.phase("process")
+    assert process.min > result.phase("boot").max
+    assert "first_response" in format_report(result)
+
+
+def test_cold_start_factory(app_dir):
+    result = ColdStartBenchmark(
+        "coldstart_app:create_app",
+        runs=1,
+        path="/health",
+        factory=True,
+        cwd=str(app_dir),
+    ).run()
+
+    assert not result.errors
+
+
+def test_cold_start_errors(app_dir):
+    result = ColdStartBenchmark(
+        "coldstart_app:app",
+        runs=1,
+        path="/missing",
+        timeout=0.2,
+        cwd=str(app_dir),
+    ).run()
+    missing_module = ColdStartBenchmark(
+        "no_such_module:app", runs=1, cwd=str(app_dir)
+    ).run()
+
+    assert "status 404" in result.errors[0].error
+    assert result.phase("process").count == 0
+    assert missing_module.errors
+
+
+def test_main_json(app_dir, monkeypatch, capsys):
+    monkeypatch.chdir(app_dir)
+    main(["coldstart_app:app", "--runs", "1", "--path", "/health", "--json"])
+    report = json.loads(capsys.readouterr().out)
+
+    assert report["runs"] == 1
+    assert report["errors"] == []
+    assert report["phases"]["boot"]["count"] == 1
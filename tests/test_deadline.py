@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.deadline import (
+    DeadlineExceeded,
+    format_tasks,
+    is_deadline,
+    run_with_deadline,
+)
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.testing import SanicASGITestClient, SanicTestClient
+
+
+@pytest.fixture
+def hung_app():
+    sanic_app = Sanic("hung_app")
+    sanic_app.ctx.cancelled = False
+    sanic_app.ctx.stopped = 0
+
+    @sanic_app.after_server_stop
+    async def stopped(app):
+        app.ctx.stopped += 1
+
+    async def wait_forever():
+        await asyncio.Event().wait()
+
+    @sanic_app.get("/hang")
+    async def hang(request):
+        try:
+            await wait_forever()
+        except asyncio.CancelledError:
+            request.app.ctx.cancelled = True
+            raise
+
+    @sanic_app.get("/")
+    async def ok(request):
+        return response.text("ok")
+
+    return sanic_app
+
+
+def test_test_client_deadline(hung_app):
+    client = SanicTestClient(hung_app)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        client.get("/hang", timeout=0.2)
+
+    assert time.monotonic() - start < 5
+    assert "GET http://127.0.0.1" in str(exc_info.value)
+    assert "wait_forever" in exc_info.value.tasks
+    assert len(hung_app.request_middleware) == 0
+
+    _, response = client.get("/", timeout=1)
+    assert response.text == "ok"
+
+
+def test_reusable_client_deadline(hung_app):
+    with ReusableClient(hung_app) as client:
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            client.get("/hang", timeout=0.2)
+        client._run(asyncio.sleep(0.1))
+        assert hung_app.ctx.cancelled
+
+        _, response = client.get("/", timeout=1)
+
+    assert "wait_forever" in exc_info.value.tasks
+    assert response.text == "ok"
+
+
+@pytest.mark.asyncio
+async def test_asgi_client_deadline(hung_app):
+    client = SanicASGITestClient(hung_app)
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        await client.get("/hang", timeout=0.2)
+
+    assert "wait_forever" in exc_info.value.tasks
+    assert hung_app.ctx.cancelled
+    assert hung_app.ctx.stopped == 1
+
+    _, response = await client.get("/", timeout=1)
+    assert response.text == "ok"
+
+
+@pytest.mark.asyncio
+async def test_run_with_deadline():
+    assert await run_with_deadline(asyncio.sleep(0, "done"), 1, "x") == "done"
+    assert await run_with_deadline(asyncio.sleep(0, "done"), None, "x")
+    with pytest.raises(DeadlineExceeded, match="sleeping did not complete"):
+        await run_with_deadline(asyncio.sleep(10), 0.01, "sleeping")
+
+    assert "1 pending task(s)" in format_tasks(exclude=None)
+
+
+def test_is_deadline():
+    assert is_deadline(1)
+    assert is_deadline(0.5)
+    assert not is_deadline(None)
+    assert not is_deadline(True)
+    assert not is_deadline(object())
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from sanic import Request, Sanic, response
+
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.testing import SanicASGITestClient, SanicTestClient
+
+
+class CountingLoads:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        return json.loads(data)
+
+
+@pytest.fixture
+def json_app():
+    sanic_app = Sanic("json_app")
+
+    @sanic_app.get("/empty")
+    def empty(request):
+        return response.json({})
+
+    @sanic_app.get("/zero")
+    def zero(request):
+        return response.json(0)
+
+    @sanic_app.get("/text")
+    def text(request):
+        return response.text("not json")
+
+    return sanic_app
+
+
+@pytest.mark.parametrize("path,expected", [("/empty", {}), ("/zero", 0)])
+def test_json_is_decoded_once(json_app, path, expected):
+    loads = CountingLoads()
+    client = SanicTestClient(json_app, json_loads=loads)
+    _, response = client.get(path)
+
+    assert response.json == expected
+    assert response.json == expected
+    assert loads.calls == 1
+
+
+def test_invalid_json_is_none(json_app):
+    loads = CountingLoads()
+    client = SanicTestClient(json_app, json_loads=loads)
+    _, response = client.get("/text")
+
+    assert response.json is None
+    assert response.json is None
+    assert loads.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_asgi_custom_json_loads(json_app):
+    loads = CountingLoads()
+    client = SanicASGITestClient(json_app, json_loads=loads)
+    _, response = await client.get("/empty")
+
+    assert response.json == {}
+    assert loads.calls == 1
+
+
+def test_defaults_to_app_loads():
+    loads = CountingLoads()
+
+    class CustomRequest(Request):
+        _loads = loads
+
+    sanic_app = Sanic("custom_loads_app", request_class=CustomRequest)
+
+    @sanic_app.get("/")
+    def handler(request):
+        return response.json({"foo": "bar"})
+
+    _, response_ = sanic_app.test_client.get("/")
+
+    assert response_.json == {"foo": "bar"}
+    assert loads.calls == 1
+
+
+def test_reusable_client_json_loads(json_app):
+    loads = CountingLoads()
+    with ReusableClient(json_app, json_loads=loads) as client:
+        _, response = client.get("/zero")
+
+        assert response.json == 0
+        assert response.json == 0
+    assert loads.calls == 1
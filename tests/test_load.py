@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.load import (
+    LatencySummary,
+    OpenLoopLoad,
+    arrival_schedule,
+    percentile,
+)
+from sanic_testing.reusable import ReusableClient
+
+
+@pytest.fixture
+def load_app():
+    sanic_app = Sanic("load_app")
+
+    @sanic_app.get("/")
+    async def basic(request):
+        return response.text("foo")
+
+    @sanic_app.get("/blocking")
+    def blocking(request):
+        time.sleep(0.02)
+        return response.text("foo")
+
+    return sanic_app
+
+
+def test_arrival_schedule_constant():
+    schedule = arrival_schedule(10, 2)
+
+    assert len(schedule) == 20
+    assert schedule[:3] == [0.0, 0.1, 0.2]
+
+
+def test_arrival_schedule_ramp():
+    schedule = arrival_schedule(0, 2, ramp_to=20)
+
+    assert len(schedule) == 20
+    assert schedule == sorted(schedule)
+    assert schedule[-1] < 2
+    # Arrivals get closer together as the rate ramps up
+    assert schedule[1] - schedule[0] > schedule[-1] - schedule[-2]
+
+
+def test_percentile():
+    ordered = list(range(1, 101))
+
+    assert percentile(ordered, 50) == 50
+    assert percentile(ordered, 99) == 99
+    assert percentile(ordered, 100) == 100
+    assert LatencySummary([3, 1, 2]).as_dict()["p50"] == 2
+
+
+def test_open_loop_load(load_app):
+    with ReusableClient(load_app) as client:
+        result = OpenLoopLoad(client, "/", rate=200, duration=0.25).run()
+
+    assert result.scheduled == 50
+    assert result.completed == 50
+    assert result.statuses == {200: 50}
+    assert not result.errors
+
+
+def test_open_loop_load_counts_queueing(load_app):
+    with ReusableClient(load_app) as client:
+        result = OpenLoopLoad(
+            client, "/blocking", rate=100, duration=0.2
+        ).run()
+
+    assert result.completed == 20
+    # The handler blocks the loop for longer than the arrival interval,
+    # so requests fall behind schedule and that delay must be counted
+    assert result.latency.max > result.service_time.max
+    assert result.latency.max >= 0.2
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing import TestManager
+from sanic_testing.load import OpenLoopLoad
+from sanic_testing.loops import (
+    available_loop_factories,
+    compare_loops,
+    format_comparison,
+)
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.sync import SyncASGITestClient
+
+
+class CustomLoop(asyncio.SelectorEventLoop): ...
+
+
+@pytest.fixture
+def loop_app():
+    sanic_app = Sanic("loop_app")
+
+    @sanic_app.get("/")
+    async def handler(request):
+        loop = asyncio.get_running_loop()
+        return response.text(type(loop).__name__)
+
+    return sanic_app
+
+
+def test_reusable_client_loop_factory(loop_app):
+    with ReusableClient(loop_app, loop_factory=CustomLoop) as client:
+        _, response = client.get("/")
+
+    assert response.text == "CustomLoop"
+
+
+def test_sync_asgi_client_loop_factory(loop_app):
+    with SyncASGITestClient(loop_app, loop_factory=CustomLoop) as client:
+        _, response = client.get("/")
+
+    assert response.text == "CustomLoop"
+
+
+def test_test_client_loop_factory(loop_app):
+    policy = asyncio.get_event_loop_policy()
+    TestManager(loop_app, loop_factory=CustomLoop)
+
+    _, response = loop_app.test_client.get("/")
+
+    assert response.text == "CustomLoop"
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_compare_loops(loop_app):
+    def benchmark(loop_factory):
+        with ReusableClient(loop_app, loop_factory=loop_factory) as client:
+            return OpenLoopLoad(client, rate=100, duration=0.1).run()
+
+    results = compare_loops(benchmark)
+
+    assert set(results) == set(available_loop_factories())
+    assert all(result.completed == 10 for result in results.values())
+    assert "asyncio" in format_comparison(results)
+
+
+def test_compare_loops_unavailable():
+    with pytest.raises(ValueError):
+        compare_loops(lambda factory: None, loops=["nope"])
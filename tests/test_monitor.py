@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing import TestManager
+from sanic_testing.monitor import LoopBlockedError, LoopMonitor
+from sanic_testing.reusable import ReusableClient
+
+
+def _blocking_app(name):
+    sanic_app = Sanic(name)
+
+    @sanic_app.get("/blocking")
+    async def blocking(request):
+        time.sleep(0.2)
+        return response.text("foo")
+
+    @sanic_app.get("/sleeping")
+    async def sleeping(request):
+        await asyncio.sleep(0.2)
+        return response.text("foo")
+
+    return sanic_app
+
+
+def test_monitor_reports_blocking_handler():
+    monitor = LoopMonitor(threshold=0.05)
+    app = _blocking_app("monitor_report")
+    TestManager(app, loop_monitor=monitor)
+
+    _, response = app.test_client.get("/blocking")
+
+    assert response.status == 200
+    assert monitor.events
+    assert monitor.max_lag >= 0.15
+    assert "time.sleep(0.2)" in monitor.events[0].stack
+
+
+def test_monitor_ignores_awaiting_handler():
+    monitor = LoopMonitor(threshold=0.05, fail=True)
+    app = _blocking_app("monitor_awaiting")
+
+    with ReusableClient(app, loop_monitor=monitor) as client:
+        _, response = client.get("/sleeping")
+
+    assert response.status == 200
+    assert not monitor.events
+
+
+def test_monitor_fails_reusable_client():
+    monitor = LoopMonitor(threshold=0.05, fail=True)
+    app = _blocking_app("monitor_reusable")
+
+    with ReusableClient(app, loop_monitor=monitor) as client:
+        with pytest.raises(LoopBlockedError) as exc_info:
+            client.get("/blocking")
+
+    assert "time.sleep(0.2)" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_monitor_fails_asgi_client():
+    monitor = LoopMonitor(threshold=0.05, fail=True)
+    app = _blocking_app("monitor_asgi")
+    TestManager(app, loop_monitor=monitor)
+
+    with pytest.raises(LoopBlockedError):
+        await app.asgi_client.get("/blocking")
+
+    assert monitor.slow_callbacks
+    assert not asyncio.get_running_loop().get_debug()
+
+
+def test_monitor_failure_removes_request_collector():
+    monitor = LoopMonitor(threshold=0.05, fail=True)
+    app = _blocking_app("monitor_cleanup")
+    TestManager(app, loop_monitor=monitor)
+
+    with pytest.raises(LoopBlockedError):
+        app.test_client.get("/blocking")
+
+    assert len(app.request_middleware) == 0
+
+
+@pytest.mark.asyncio
+async def test_overlapping_watches_restore_the_loop():
+    monitor = LoopMonitor(threshold=0.5)
+    loop = asyncio.get_running_loop()
+    slow_callback_duration = loop.slow_callback_duration
+    first, second = monitor.watch(), monitor.watch()
+
+    # The first watch to start is also the first to end
+    await first.__aenter__()
+    await second.__aenter__()
+    await first.__aexit__(None, None, None)
+    assert loop.get_debug()
+    await second.__aexit__(None, None, None)
+
+    assert not loop.get_debug()
+    assert loop.slow_callback_duration == slow_callback_duration
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_restore_the_loop():
+    monitor = LoopMonitor(threshold=0.5)
+    app = _blocking_app("monitor_overlap")
+    TestManager(app, loop_monitor=monitor)
+    loop = asyncio.get_running_loop()
+    slow_callback_duration = loop.slow_callback_duration
+
+    first = asyncio.ensure_future(app.asgi_client.get("/sleeping"))
+    await asyncio.sleep(0.1)
+    await asyncio.gather(first, app.asgi_client.get("/sleeping"))
+
+    assert not loop.get_debug()
+    assert loop.slow_callback_duration == slow_callback_duration
+    assert not monitor.events
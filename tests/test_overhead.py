@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from sanic import Blueprint, Sanic, response
+
+from sanic_testing.overhead import MiddlewareProfiler
+from sanic_testing.reusable import ReusableClient
+
+
+@pytest.fixture
+def layered_app():
+    sanic_app = Sanic("layered_app")
+    bp = Blueprint("bp", url_prefix="/bp")
+
+    @sanic_app.on_request
+    async def authenticate(request):
+        await asyncio.sleep(0.01)
+
+    @sanic_app.on_request
+    def trace(request):
+        request.ctx.traced = True
+
+    @sanic_app.on_response
+    async def cors(request, response):
+        response.headers["access-control-allow-origin"] = "*"
+
+    @bp.on_request
+    async def blueprint_only(request):
+        await asyncio.sleep(0.005)
+
+    @sanic_app.signal("http.routing.after")
+    async def routed(request, route, kwargs, handler):
+        request.ctx.routed = True
+
+    @sanic_app.get("/")
+    async def handler(request):
+        return response.json(
+            {"traced": request.ctx.traced, "routed": request.ctx.routed}
+        )
+
+    @bp.get("/")
+    async def bp_handler(request):
+        return response.text("bp")
+
+    sanic_app.blueprint(bp)
+    return sanic_app
+
+
+def _by_name(profiler):
+    return {
+        timing.name.rsplit(".", 1)[-1]: timing for timing in profiler.timings
+    }
+
+
+def test_profile_test_client(layered_app):
+    profiler = MiddlewareProfiler(layered_app)
+    with profiler:
+        for _ in range(3):
+            _, response = layered_app.test_client.get("/")
+        layered_app.test_client.get("/bp")
+
+    assert response.json == {"traced": True, "routed": True}
+    assert response.headers["access-control-allow-origin"] == "*"
+
+    timings = _by_name(profiler)
+    assert timings["authenticate"].calls == 4
+    assert timings["authenticate"].kind == "request middleware"
+    assert timings["authenticate"].latency.min >= 0.01
+    assert timings["trace"].calls == 4
+    assert timings["cors"].kind == "response middleware"
+    assert timings["blueprint_only"].calls == 1
+    assert timings["routed"].kind == "signal http.routing.after"
+    assert timings["routed"].calls == 4
+    assert profiler.timings[0].name.endswith("authenticate")
+    assert not any("sanic_testing" in name for name in timings)
+
+    report = profiler.report().splitlines()
+    assert report[0].split()[:2] == ["KIND", "NAME"]
+    assert "authenticate" in report[1]
+
+
+def test_profile_reusable_client(layered_app):
+    with ReusableClient(layered_app) as client:
+        with MiddlewareProfiler(layered_app) as profiler:
+            client.get("/")
+            client.get("/bp")
+            profiler.reset()
+            client.get("/")
+        client.get("/")
+
+    timings = _by_name(profiler)
+    assert timings["authenticate"].calls == 1
+    assert "blueprint_only" not in timings
+    assert not getattr(
+        layered_app.request_middleware[0].func, "__profiled__", False
+    )
+
+
+def test_profile_asgi_client(layered_app):
+    with MiddlewareProfiler(layered_app) as profiler:
+        asyncio.run(layered_app.asgi_client.get("/"))
+
+    assert _by_name(profiler)["authenticate"].calls == 1
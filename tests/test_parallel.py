@@ -0,0 +1,100 @@
+import os
+import pickle
+from functools import partial
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing._specs import normalize_request
+from sanic_testing.load import LoadResult
+from sanic_testing.parallel import ProcessPoolRunner, _portable
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.testing import SanicASGITestClient
+
+
+def create_app(name="parallel_app"):
+    sanic_app = Sanic(name)
+
+    @sanic_app.get("/<number:int>")
+    async def double(request, number):
+        return response.json({"pid": os.getpid(), "n": number})
+
+    @sanic_app.post("/echo")
+    async def echo(request):
+        return response.raw(request.body)
+
+    return sanic_app
+
+
+@pytest.fixture
+def parallel_app():
+    return create_app()
+
+
+def test_map_preserves_order(parallel_app):
+    requests = [f"/{n}" for n in range(40)]
+    requests.append(("post", "/echo", {"content": b"hello"}))
+    with ProcessPoolRunner(parallel_app, processes=2) as runner:
+        result = runner.map(requests)
+
+    assert [record.index for record in result.records] == list(range(41))
+    assert [
+        pickle.loads(pickle.dumps(record)).status for record in result.records
+    ] == [200] * 41
+    assert result.records[7].headers["content-type"] == "application/json"
+    assert result.records[-1].body == b"hello"
+    assert result.latency.count == 41
+    assert result.statuses[200] == 41
+    assert not result.errors
+
+    pids = {
+        int(record.body.split(b",")[0].split(b":")[1])
+        for record in result.records[:-1]
+    }
+    assert len(pids) == 2
+
+
+def test_map_with_factory_and_client(parallel_app):
+    factory = partial(create_app, "parallel_factory_app")
+    with ProcessPoolRunner(factory, processes=1) as runner:
+        assert runner.map(["/1"]).statuses[200] == 1
+
+    client = SanicASGITestClient(parallel_app)
+    with ProcessPoolRunner(client, processes=1) as runner:
+        result = runner.map(["/1", "/missing"])
+    assert [record.status for record in result.records] == [200, 404]
+
+
+def test_load_against_live_server(parallel_app):
+    with ReusableClient(parallel_app) as client:
+        url = f"http://{client.host}:{client.port}"
+        with ProcessPoolRunner(url, processes=2) as runner:
+            # The server runs on this process's loop, driven by the client
+            future = client._loop.run_in_executor(
+                None,
+                lambda: runner.load("/1", rate=100, duration=0.5, warmup=0.5),
+            )
+            result = client._run(future)
+
+    assert isinstance(result, LoadResult)
+    assert result.scheduled == 50
+    assert result.statuses[200] == 50
+    assert result.latency.count == 50
+
+
+def test_normalize_and_portable():
+    assert normalize_request("/") == ("GET", "/", {})
+    assert normalize_request(("post", "/a")) == ("POST", "/a", {})
+    assert normalize_request(("put", "/a", {"json": 1})) == (
+        "PUT",
+        "/a",
+        {"json": 1},
+    )
+
+    class Unpicklable(Exception):
+        def __reduce__(self):
+            raise TypeError("nope")
+
+    assert isinstance(_portable(Unpicklable("x")), RuntimeError)
+    error = ValueError("x")
+    assert _portable(error) is error
@@ -24,3 +24,13 @@ def test_basic_asgi_client(reusable_app):
         assert request.method.lower() == "get"
         assert response.body == b"foo"
         assert response.status == 200
+
+
+def test_request_collectors_are_removed(reusable_app):
+    with ReusableClient(reusable_app) as client:
+        for _ in range(5):
+            client.get("/")
+
+        assert len(reusable_app.request_middleware) == 0
+        for route in reusable_app.router.routes:
+            assert len(route.extra.request_middleware) == 0
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.stress import (
+    ConcurrencyStress,
+    LevelResult,
+    StressResult,
+    format_report,
+)
+
+
+@pytest.fixture
+def shared_state_app():
+    sanic_app = Sanic("shared_state_app")
+    sanic_app.ctx.hits = 0
+
+    @sanic_app.get("/greet/<name>")
+    async def greet(request, name):
+        # Kept on app.ctx across an await, as if it were per request
+        request.app.ctx.name = name
+        await asyncio.sleep(0.001)
+        return response.text(f"hello {request.app.ctx.name}")
+
+    @sanic_app.get("/safe/<name>")
+    async def safe(request, name):
+        await asyncio.sleep(0.001)
+        return response.text(f"hello {name}")
+
+    @sanic_app.get("/hits")
+    async def hits(request):
+        request.app.ctx.hits += 1
+        return response.text(str(request.app.ctx.hits))
+
+    return sanic_app
+
+
+def test_detects_shared_state(shared_state_app):
+    with ReusableClient(shared_state_app) as client:
+        result = ConcurrencyStress(
+            client, ["/greet/alice", "/greet/bob"], levels=(1, 4)
+        ).run()
+
+    assert [level.concurrency for level in result.levels] == [1, 4]
+    assert not result.levels[0].divergences
+    assert result.levels[1].divergences
+    assert result.diverged
+    divergence = result.divergences[0]
+    assert divergence.concurrency == 4
+    assert divergence.uri in ("/greet/alice", "/greet/bob")
+    assert divergence.expected != divergence.actual
+
+
+def test_no_divergence_without_shared_state(shared_state_app):
+    with ReusableClient(shared_state_app) as client:
+        result = ConcurrencyStress(
+            client,
+            ["/safe/alice", ("GET", "/safe/bob")],
+            levels=(1, 2, 8),
+            rounds=2,
+        ).run()
+
+    assert not result.diverged
+    assert [level.requests for level in result.levels] == [4, 8, 32]
+    assert all(
+        level.latency.count == level.requests for level in result.levels
+    )
+    assert result.peak in result.levels
+
+
+def test_unstable_responses_are_not_compared(shared_state_app):
+    with ReusableClient(shared_state_app) as client:
+        result = ConcurrencyStress(
+            client, ["/safe/alice", "/hits"], levels=(4,)
+        ).run()
+
+    assert result.unstable == [1]
+    assert not result.diverged
+
+
+def _level(concurrency, throughput):
+    return LevelResult(
+        concurrency, throughput, 1.0, [0.001] * throughput, [], []
+    )
+
+
+def test_peak_and_degradation():
+    result = StressResult(
+        [_level(1, 100), _level(2, 180), _level(4, 200), _level(8, 150)], []
+    )
+
+    assert result.peak.concurrency == 4
+    assert result.degrades_at.concurrency == 8
+    assert "peak" in format_report(result)
+    assert "degraded" in format_report(result)
+
+
+def test_no_degradation_within_tolerance():
+    result = StressResult([_level(1, 100), _level(2, 200), _level(4, 190)], [])
+
+    assert result.peak.concurrency == 2
+    assert result.degrades_at is None
@@ -0,0 +1,79 @@
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing._report import render_table
+from sanic_testing.sweep import RouteSweep, format_table
+
+
+@pytest.fixture
+def sweep_app():
+    sanic_app = Sanic("sweep_app")
+
+    @sanic_app.get("/")
+    async def index(request):
+        return response.text("foo")
+
+    @sanic_app.route("/items/<item_id:int>", methods=["GET", "DELETE"])
+    async def item(request, item_id):
+        assert isinstance(item_id, int)
+        return response.json({"id": item_id})
+
+    @sanic_app.get("/users/<user_id:uuid>/<day:ymd>/<name:slug>")
+    async def user(request, user_id, day, name):
+        return response.text(f"{user_id} {day} {name}")
+
+    @sanic_app.get("/files/<filename:ext=txt>")
+    async def files(request, filename, ext):
+        return response.text(f"{filename}.{ext}")
+
+    @sanic_app.get("/code/<code:[A-Z]{2}>")
+    async def code(request, code):
+        return response.text(code)
+
+    @sanic_app.get("/regex/<value:[xyz]{4}>")
+    async def regex(request, value):
+        return response.text(value)
+
+    @sanic_app.websocket("/ws")
+    async def ws(request, ws): ...
+
+    return sanic_app
+
+
+def test_route_sweep(sweep_app):
+    sweep = RouteSweep(sweep_app, repeat=2)
+    timings = sweep.run()
+    by_route = {(t.method, t.name): t for t in timings}
+
+    assert by_route["GET", "sweep_app.index"].status == 200
+    assert by_route["GET", "sweep_app.item"].path == "/items/1"
+    assert by_route["DELETE", "sweep_app.item"].status == 200
+    assert by_route["GET", "sweep_app.user"].status == 200
+    assert by_route["GET", "sweep_app.files"].path == "/files/test.txt"
+    assert all(t.latency.count == 2 for t in timings)
+    assert all(t.size for t in timings)
+    assert set(sweep.skipped) == {
+        "sweep_app.ws",
+        "sweep_app.code",
+        "sweep_app.regex",
+    }
+    assert "/items/1" in format_table(timings)
+
+
+def test_route_sweep_overrides(sweep_app):
+    timings = RouteSweep(
+        sweep_app,
+        methods=["get"],
+        params={"sweep_app.regex": {"value": "xyzx"}},
+    ).run()
+    by_name = {t.name: t for t in timings}
+
+    assert by_name["sweep_app.regex"].path == "/regex/xyzx"
+    assert by_name["sweep_app.regex"].status == 200
+    assert all(t.method == "GET" for t in timings)
+
+
+def test_render_table():
+    table = render_table(("NAME", "MS"), [("a", "1.000"), ("long", "2")])
+
+    assert table.splitlines() == ["NAME  MS   ", "a     1.000", "long  2    "]
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sanic import response
+from sanic.request import Request
+
+from sanic_testing.sync import SyncASGITestClient
+
+
+@pytest.mark.parametrize(
+    "method", ["get", "post", "patch", "put", "delete", "options"]
+)
+def test_basic_sync_asgi_client(app, method):
+    with SyncASGITestClient(app) as client:
+        request, response = getattr(client, method)("/")
+
+    assert isinstance(request, Request)
+    assert response.body == b"foo"
+    assert response.status == 200
+    assert response.content_type == "text/plain; charset=utf-8"
+
+
+def test_sync_asgi_client_reuses_loop(app):
+    loops = []
+
+    @app.get("/loop")
+    async def handler(request):
+        loops.append(asyncio.get_running_loop())
+        return response.empty()
+
+    with SyncASGITestClient(app) as client:
+        client.get("/loop")
+        client.get("/loop")
+        client.request("GET", "/loop")
+
+    assert len(loops) == 3
+    assert loops[0] is loops[1] is loops[2]
+    assert loops[0].is_closed()
+
+
+def test_sync_asgi_client_leaves_given_loop_open(app):
+    loop = asyncio.new_event_loop()
+    with SyncASGITestClient(app, loop=loop) as client:
+        _, response = client.get("/")
+
+    assert response.status == 200
+    assert not loop.is_closed()
+    loop.close()
+
+
+def test_sync_asgi_client_closed(app):
+    client = SyncASGITestClient(app)
+    client.close()
+
+    with pytest.raises(RuntimeError):
+        client.get("/")
@@ -90,3 +90,10 @@ def test_listeners(app):
 
     assert len(listeners) == 4
     assert all(x in listeners for x in available)
+
+
+def test_request_collector_is_removed(app):
+    for _ in range(3):
+        app.test_client.get("/")
+
+    assert len(app.request_middleware) == 0
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.testing import SanicTestClient
+from sanic_testing.throttle import ThrottledTransport
+
+PAYLOAD = b"x" * 256 * 1024
+# Large enough to overflow the loopback socket buffers
+LARGE_PAYLOAD = b"x" * 8 * 1024 * 1024
+
+
+@pytest.fixture
+def throttle_app():
+    sanic_app = Sanic("throttle_app")
+
+    @sanic_app.get("/large")
+    async def large(request):
+        return response.raw(PAYLOAD)
+
+    @sanic_app.get("/larger")
+    async def larger(request):
+        return response.raw(LARGE_PAYLOAD)
+
+    @sanic_app.post("/echo")
+    async def echo(request):
+        return response.text(str(len(request.body)))
+
+    return sanic_app
+
+
+def test_throttled_upload_splits_writes(throttle_app):
+    throttle = ThrottledTransport(write_size=1024)
+    client = ReusableClient(
+        throttle_app, client_kwargs={"transport": throttle}
+    )
+    with client:
+        _, response = client.post("/echo", content=b"y" * 10000)
+
+    assert response.text == "10000"
+    assert throttle.stats.writes == 10
+    assert throttle.stats.bytes_sent == 10000
+
+
+def test_throttled_download(throttle_app):
+    throttle = ThrottledTransport(
+        read_size=16 * 1024,
+        download_rate=4 * 1024 * 1024,
+        receive_buffer=16384,
+    )
+    client = ReusableClient(
+        throttle_app, client_kwargs={"transport": throttle}
+    )
+    with client:
+        start = time.perf_counter()
+        _, response = client.get("/large")
+        elapsed = time.perf_counter() - start
+
+    assert response.body == PAYLOAD
+    assert elapsed >= len(PAYLOAD) / (4 * 1024 * 1024)
+    assert throttle.stats.bytes_received == len(PAYLOAD)
+    assert throttle.stats.reads >= len(PAYLOAD) // (16 * 1024)
+
+
+def test_slow_reader_builds_server_buffer(throttle_app):
+    throttle = ThrottledTransport(read_delay=0.1, receive_buffer=16384)
+    throttle.watch(throttle_app)
+    client = ReusableClient(
+        throttle_app, client_kwargs={"transport": throttle}
+    )
+    with client:
+        _, response = client.get("/larger")
+
+    assert len(response.body) == len(LARGE_PAYLOAD)
+    assert throttle.stats.server_writes >= 1
+    assert throttle.stats.server_buffered_max > 0
+
+
+def test_throttle_survives_test_client_sessions(throttle_app):
+    throttle = ThrottledTransport(read_size=1024)
+    client = SanicTestClient(throttle_app)
+    for _ in range(2):
+        _, response = client.get(
+            "/large", session_kwargs={"transport": throttle}
+        )
+        assert response.body == PAYLOAD
+
+    assert throttle.stats.requests == 2
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing import TestManager
+from sanic_testing.reusable import ReusableClient
+
+# asyncio timers may fire up to the loop's clock resolution early, so a
+# 50ms sleep between two chunks can show up as a slightly shorter gap
+TIMER_SLACK = 0.005
+
+
+@pytest.fixture
+def sse_app():
+    sanic_app = Sanic("sse_app")
+    TestManager(sanic_app)
+
+    @sanic_app.get("/events")
+    async def events(request):
+        resp = await request.respond(content_type="text/event-stream")
+        await asyncio.sleep(0.1)
+        await resp.send("data: first\n\n")
+        await asyncio.sleep(0.05)
+        await resp.send("data: second\n\n")
+        await resp.eof()
+
+    @sanic_app.get("/")
+    async def basic(request):
+        return response.text("foo")
+
+    return sanic_app
+
+
+def _assert_event_timing(response):
+    assert response.body == b"data: first\n\ndata: second\n\n"
+    assert response.headers_time < response.ttfb
+    assert response.ttfb >= 0.1
+    assert len(response.chunk_times) == 2
+    assert response.chunk_times[0] == response.ttfb
+    assert response.chunk_gaps[0] >= 0.05 - TIMER_SLACK
+
+
+def test_reusable_client_timing(sse_app):
+    with ReusableClient(sse_app) as client:
+        _, response = client.get("/events")
+        _, basic = client.get("/")
+
+    _assert_event_timing(response)
+    assert basic.body == b"foo"
+    assert basic.ttfb is not None
+
+
+@pytest.mark.asyncio
+async def test_asgi_client_timing(sse_app):
+    _, response = await sse_app.asgi_client.get("/events")
+
+    _assert_event_timing(response)
+
+
+def test_untimed_response_defaults(sse_app):
+    _, response = sse_app.test_client.get("/")
+
+    assert response.ttfb is None
+    assert response.chunk_gaps == []
@@ -0,0 +1,68 @@
+import httpx
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.reusable import ReusableClient
+
+pytest.importorskip("trustme")
+
+from sanic_testing.tls import LocalTLS  # noqa: E402
+
+
+@pytest.fixture
+def tls_app():
+    sanic_app = Sanic("tls_app")
+
+    @sanic_app.get("/")
+    async def basic(request):
+        return response.json({"scheme": request.scheme, "body": "x" * 100000})
+
+    return sanic_app
+
+
+def test_reusable_client_tls(tls_app):
+    with ReusableClient(tls_app, tls=True) as client:
+        request, response = client.get("/")
+        client.get("/")
+
+    assert request.scheme == "https"
+    assert response.json["scheme"] == "https"
+    assert len(response.json["body"]) == 100000
+
+    stats = client.wire_stats
+    assert stats.connections_opened == 1
+    (handshake,) = stats.handshakes
+    assert handshake.duration > 0
+    assert handshake.version.startswith("TLS")
+    assert not handshake.resumed
+
+
+@pytest.mark.parametrize("resume,rate", ((True, 0.75), (False, 0.0)))
+def test_session_resumption(tls_app, resume, rate):
+    client = ReusableClient(
+        tls_app,
+        tls=True,
+        resume_tls_sessions=resume,
+    )
+    with client:
+        for _ in range(4):
+            _, response = client.get("/", headers={"connection": "close"})
+            assert response.status == 200
+
+    assert client.wire_stats.connections_opened == 4
+    assert client.wire_stats.resumption_rate == rate
+    assert len(client.wire_stats.handshake_times) == 4
+
+
+def test_local_tls_contexts():
+    tls = LocalTLS()
+    assert tls.client_context is tls.client_context
+    assert tls.server_context.verify_mode.name == "CERT_NONE"
+
+
+def test_tls_rejects_own_transport(tls_app):
+    transport = httpx.AsyncHTTPTransport()
+    with pytest.raises(ValueError, match="tls=True"):
+        ReusableClient(
+            tls_app, tls=True, client_kwargs={"transport": transport}
+        )
@@ -0,0 +1,138 @@
+import httpx
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.load import OpenLoopLoad
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.upstream import MockUpstream, exponential
+
+
+@pytest.fixture
+def upstream():
+    upstream = MockUpstream(seed=1)
+    upstream.route("/price", json={"price": 10})
+    upstream.route("/slow", latency=0.5)
+    upstream.route("/flaky", error_rate=0.5)
+    upstream.route("/dropped", drop_rate=1.0)
+    upstream.route("/unknown", status=599)
+    return upstream
+
+
+@pytest.fixture
+def proxy_app():
+    sanic_app = Sanic("proxy_app")
+    sanic_app.ctx.base_url = "http://upstream.test"
+    sanic_app.ctx.mounts = {}
+
+    @sanic_app.before_server_start
+    async def open_client(app):
+        app.ctx.client = httpx.AsyncClient(timeout=0.1, mounts=app.ctx.mounts)
+
+    @sanic_app.after_server_stop
+    async def close_client(app):
+        await app.ctx.client.aclose()
+
+    @sanic_app.get("/<name>")
+    async def proxy(request, name):
+        url = f"{request.app.ctx.base_url}/{name}"
+        try:
+            upstream = await request.app.ctx.client.get(url)
+        except httpx.TimeoutException:
+            return response.text("timeout", status=504)
+        except httpx.TransportError:
+            return response.text("dropped", status=502)
+        return response.raw(upstream.content, status=upstream.status_code)
+
+    return sanic_app
+
+
+def test_mounted_transport(proxy_app, upstream):
+    proxy_app.ctx.mounts = {"http://upstream.test": upstream.transport()}
+    _, response = proxy_app.test_client.get("/price")
+    _, timeout = proxy_app.test_client.get("/slow")
+    _, dropped = proxy_app.test_client.get("/dropped")
+    _, missing = proxy_app.test_client.get("/missing")
+
+    assert response.json == {"price": 10}
+    assert timeout.status == 504
+    assert dropped.status == 502
+    assert missing.status == 404
+    assert upstream.requests[0] == ("GET", "/price")
+
+
+def test_error_rate_is_seeded(proxy_app, upstream):
+    proxy_app.ctx.mounts = {"http://upstream.test": upstream.transport()}
+    results = []
+    for _ in range(2):
+        upstream._random.seed(1)
+        results.append(
+            [proxy_app.test_client.get("/flaky")[1].status for _ in range(10)]
+        )
+
+    assert results[0] == results[1]
+    assert set(results[0]) == {200, 503}
+    assert upstream.routes[2].errors == results[0].count(503) * 2
+
+
+def test_latency_distributions():
+    upstream = MockUpstream(seed=1)
+    fixed = upstream.route("/fixed", latency=0.1)
+    ranged = upstream.route("/range", latency=(0.1, 0.2))
+    tail = upstream.route("/tail", latency=exponential(0.1))
+
+    rng = upstream._random
+    assert fixed.delay(rng) == 0.1
+    assert all(0.1 <= ranged.delay(rng) <= 0.2 for _ in range(100))
+    assert 0.05 < sum(tail.delay(rng) for _ in range(1000)) / 1000 < 0.15
+
+
+def test_live_upstream_with_reusable_client(proxy_app, upstream):
+    upstream.attach(proxy_app)
+
+    @proxy_app.before_server_start
+    async def point_at_upstream(app):
+        app.ctx.base_url = upstream.url
+
+    with ReusableClient(proxy_app) as client:
+        _, response = client.get("/price")
+        _, timeout = client.get("/slow")
+        _, dropped = client.get("/dropped")
+
+    assert response.json == {"price": 10}
+    assert timeout.status == 504
+    assert dropped.status == 502
+    # The timed out connection is discarded, the others are kept alive
+    assert upstream.connections == 2
+
+
+def test_live_upstream_under_load(proxy_app):
+    upstream = MockUpstream(seed=1)
+    # Short enough that the responses keep up with the request rate on a
+    # busy machine, long enough for requests to overlap
+    upstream.route("/price", latency=0.02)
+    upstream.attach(proxy_app)
+
+    @proxy_app.before_server_start
+    async def point_at_upstream(app):
+        app.ctx.base_url = upstream.url
+
+    with ReusableClient(proxy_app) as client:
+        result = OpenLoopLoad(client, "/price", rate=100, duration=0.5).run()
+
+    assert result.statuses[200] == result.completed
+    assert upstream.peak_in_flight > 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_as_context_manager(upstream):
+    async with upstream:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{upstream.url}/price")
+            unknown = await client.get(f"{upstream.url}/unknown")
+            with pytest.raises(httpx.RemoteProtocolError):
+                await client.get(f"{upstream.url}/dropped")
+
+    assert response.json() == {"price": 10}
+    assert unknown.status_code == 599
+    with pytest.raises(RuntimeError):
+        upstream.url
@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+import subprocess
+import sys
+
+import httpx
+import pytest
+from sanic import Sanic, response
+
+from sanic_testing.reusable import ReusableClient
+from sanic_testing.testing import SanicTestClient
+from sanic_testing.throttle import ThrottledTransport
+from sanic_testing.wire import WireStats, wire_transport
+
+TEXT = b"sanic " * 10000
+
+
+@pytest.fixture
+def wire_app():
+    sanic_app = Sanic("wire_app")
+
+    @sanic_app.get("/")
+    async def basic(request):
+        return response.text("foo")
+
+    @sanic_app.get("/gzip")
+    async def compressed(request):
+        return response.raw(
+            gzip.compress(TEXT), headers={"content-encoding": "gzip"}
+        )
+
+    return sanic_app
+
+
+def test_reusable_client_keep_alive(wire_app):
+    with ReusableClient(wire_app, track_wire=True) as client:
+        _, first = client.get("/")
+        _, second = client.get("/")
+        _, third = client.post("/", content=b"x" * 100)
+
+    stats = client.wire_stats
+    assert stats.connections_opened == 1
+    assert stats.requests == 3
+    assert stats.reused_requests == 2
+    assert stats.requests_per_connection == 3
+    assert not first.wire.reused
+    assert second.wire.reused
+    assert first.wire.connection is third.wire.connection
+    assert third.wire.bytes_sent > first.wire.bytes_sent + 100
+    assert first.wire.overhead_bytes > 0
+    assert stats.bytes_received == sum(
+        exchange.bytes_received for exchange in stats.exchanges
+    )
+
+
+def test_compression_accounting(wire_app):
+    with ReusableClient(wire_app, track_wire=True) as client:
+        _, response = client.get("/gzip")
+
+    assert response.body == TEXT
+    assert response.wire.content_bytes == len(TEXT)
+    assert response.wire.body_bytes == len(gzip.compress(TEXT))
+    assert response.wire.compression_ratio < 0.1
+
+
+def test_test_client_opens_connection_per_request(wire_app):
+    client = SanicTestClient(wire_app, track_wire=True)
+    client.get("/")
+    _, response = client.get("/")
+
+    assert client.wire_stats.connections_opened == 2
+    assert client.wire_stats.connections_closed == 2
+    assert client.wire_stats.requests == 2
+    assert not response.wire.reused
+
+
+def test_wire_transport_composes(wire_app):
+    stats = WireStats()
+    client = ReusableClient(
+        wire_app, client_kwargs={"transport": wire_transport(stats)}
+    )
+    with client:
+        _, response = client.get("/")
+
+    assert stats.connections_opened == 1
+    assert response.wire is None
+
+
+def test_track_wire_rejects_own_transport(wire_app):
+    transport = ThrottledTransport(transport=wire_transport(WireStats()))
+    with pytest.raises(ValueError, match="track_wire"):
+        ReusableClient(
+            wire_app, track_wire=True, client_kwargs={"transport": transport}
+        )
+    client = SanicTestClient(wire_app, track_wire=True)
+    with pytest.raises(ValueError, match="track_wire"):
+        client.get("/", session_kwargs={"transport": transport})
+
+
+def test_wire_transport_maps_errors():
+    async def connect():
+        transport = wire_transport(WireStats())
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("http://127.0.0.1:1/")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(connect())
+
+
+def test_wire_is_imported_on_use():
+    # The rest of the package must keep working with httpcore releases
+    # that have no network backends
+    code = (
+        "import sys, sanic_testing, sanic_testing.reusable; "
+        "assert 'sanic_testing.wire' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)